@@ -5,33 +5,37 @@ Demonstrates the ambient risk detection pipeline with live data.
 """
 
 import json
+import sys
 import hashlib
+import math
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Any
+from dataclasses import dataclass
+from typing import List, Dict, Any, Tuple
 import random
+from collections import defaultdict
+from functools import lru_cache
 
 # ============================================================================
 # ONTOLOGY
 # ============================================================================
 
 ONTOLOGY = {
-    "infra.energy.grid": ["grid", "power", "electricity", "outage", "transmission", "utility", "blackout"],
-    "infra.energy.oil": ["oil", "petroleum", "crude", "refinery", "pipeline", "fuel", "gas"],
-    "infra.transport.rail": ["rail", "railway", "train", "freight", "locomotive", "amtrak"],
-    "infra.transport.port": ["port", "shipping", "container", "maritime", "dock", "cargo", "vessel"],
-    "infra.transport.aviation": ["airport", "aviation", "flight", "airline", "faa", "aircraft"],
-    "infra.transport.road": ["highway", "bridge", "road", "traffic", "trucking", "dot"],
-    "labor.union": ["union", "strike", "grievance", "collective", "bargaining", "nlrb", "workers"],
-    "labor.attrition": ["resignation", "attrition", "turnover", "layoff", "departure", "fired", "quit"],
-    "legal.regulation": ["regulation", "compliance", "draft", "consultation", "amendment", "rule", "policy"],
-    "supply.procurement": ["tender", "procurement", "contract", "bid", "rfp", "award", "solicitation"],
-    "supply.inventory": ["inventory", "stockpile", "shortage", "buffer", "warehouse", "supply chain"],
-    "emergency.disaster": ["disaster", "emergency", "storm", "hurricane", "tornado", "flood", "fire", "wildfire", "earthquake", "tsunami", "fema", "evacuation", "shelter"],
-    "emergency.weather": ["winter storm", "blizzard", "ice storm", "severe weather", "heat wave", "drought", "snow", "freeze"],
-    "emergency.public_health": ["pandemic", "outbreak", "epidemic", "quarantine", "public health", "cdc", "contamination"],
-    "finance.credit": ["credit", "default", "bankruptcy", "debt", "loan", "mortgage", "foreclosure"],
-    "finance.market": ["market", "stock", "trading", "volatility", "crash", "recession", "inflation"],
+    "infra.energy.grid": ("grid", "power", "electricity", "outage", "transmission", "utility", "blackout"),
+    "infra.energy.oil": ("oil", "petroleum", "crude", "refinery", "pipeline", "fuel", "gas"),
+    "infra.transport.rail": ("rail", "railway", "train", "freight", "locomotive", "amtrak"),
+    "infra.transport.port": ("port", "shipping", "container", "maritime", "dock", "cargo", "vessel"),
+    "infra.transport.aviation": ("airport", "aviation", "flight", "airline", "faa", "aircraft"),
+    "infra.transport.road": ("highway", "bridge", "road", "traffic", "trucking", "dot"),
+    "labor.union": ("union", "strike", "grievance", "collective", "bargaining", "nlrb", "workers"),
+    "labor.attrition": ("resignation", "attrition", "turnover", "layoff", "departure", "fired", "quit"),
+    "legal.regulation": ("regulation", "compliance", "draft", "consultation", "amendment", "rule", "policy"),
+    "supply.procurement": ("tender", "procurement", "contract", "bid", "rfp", "award", "solicitation"),
+    "supply.inventory": ("inventory", "stockpile", "shortage", "buffer", "warehouse", "supply chain"),
+    "emergency.disaster": ("disaster", "emergency", "storm", "hurricane", "tornado", "flood", "fire", "wildfire", "earthquake", "tsunami", "fema", "evacuation", "shelter"),
+    "emergency.weather": ("winter storm", "blizzard", "ice storm", "severe weather", "heat wave", "drought", "snow", "freeze"),
+    "emergency.public_health": ("pandemic", "outbreak", "epidemic", "quarantine", "public health", "cdc", "contamination"),
+    "finance.credit": ("credit", "default", "bankruptcy", "debt", "loan", "mortgage", "foreclosure"),
+    "finance.market": ("market", "stock", "trading", "volatility", "crash", "recession", "inflation"),
 }
 
 SIGNAL_TYPES = {
@@ -47,11 +51,86 @@ SIGNAL_TYPES = {
     "weather_event": 0.75,
 }
 
+# Ceiling on accumulated belief for any risk vector
+MAX_BELIEF = 0.99
+
+# Flattened keyword -> path lookup built once at import, so ontology
+# detection is one pass over precompiled pairs instead of a per-call walk
+# over the ONTOLOGY dict-of-lists. Keywords are unique across paths.
+KW_TO_PATH = {kw: path for path, keywords in ONTOLOGY.items() for kw in keywords}
+_ALL_KWS = tuple(KW_TO_PATH.items())
+
+# Signal-type cue words in detection priority order: the first type with
+# any matching cue wins. Flattened to (word, type) pairs so detection is a
+# single pass that stops at the first hit.
+SIGNAL_KEYWORDS = (
+    ("deferral", ("defer", "backlog", "delayed", "postpone")),
+    ("acceleration", ("expedite", "emergency", "urgent", "immediate")),
+    ("grievance_surge", ("grievance", "complaint", "dispute")),
+    ("attrition_spike", ("resign", "departure", "exit", "leave")),
+    ("language_shift", ("extension", "consultation", "draft")),
+    ("disaster_declaration", ("disaster", "fema", "declaration", "declared")),
+    ("weather_event", ("storm", "hurricane", "tornado", "flood", "blizzard", "ice storm", "winter storm")),
+    ("emergency_response", ("evacuation", "shelter", "rescue", "response")),
+)
+_SIGNAL_KWS = tuple((w, st) for st, words in SIGNAL_KEYWORDS for w in words)
+
+# Tradability by ontology prefix, resolved by longest dotted-prefix match
+TRADABILITY_MAP = {
+    "infra.energy": {"insurance": True, "commodities": True, "logistics": True, "policy": True},
+    "infra.transport": {"insurance": True, "commodities": False, "logistics": True, "policy": False},
+    "labor": {"insurance": False, "commodities": False, "logistics": True, "policy": True},
+    "legal": {"insurance": True, "commodities": False, "logistics": False, "policy": True},
+    "supply": {"insurance": False, "commodities": True, "logistics": True, "policy": False},
+}
+_NO_TRADABILITY = {"insurance": False, "commodities": False, "logistics": False, "policy": False}
+
+# Likely outcomes per risk vector, scaled by belief at forecast time
+_OUTCOME_TEMPLATES = {
+    "infra.energy.grid": [
+        {"event": "localized_outage", "base_prob": 0.4},
+        {"event": "price_volatility", "base_prob": 0.3},
+        {"event": "policy_intervention", "base_prob": 0.2},
+    ],
+    "labor.union": [
+        {"event": "work_slowdown", "base_prob": 0.5},
+        {"event": "strike_action", "base_prob": 0.3},
+        {"event": "contract_renegotiation", "base_prob": 0.4},
+    ],
+    "emergency.disaster": [
+        {"event": "infrastructure_damage", "base_prob": 0.6},
+        {"event": "supply_chain_disruption", "base_prob": 0.5},
+        {"event": "insurance_claims_surge", "base_prob": 0.7},
+        {"event": "federal_aid_deployment", "base_prob": 0.4},
+    ],
+    "emergency.weather": [
+        {"event": "travel_disruption", "base_prob": 0.6},
+        {"event": "power_outage", "base_prob": 0.5},
+        {"event": "commodity_price_spike", "base_prob": 0.4},
+    ],
+    "infra.transport.port": [
+        {"event": "shipping_delays", "base_prob": 0.5},
+        {"event": "cargo_rerouting", "base_prob": 0.4},
+        {"event": "supply_shortage", "base_prob": 0.3},
+    ],
+    "infra.transport.rail": [
+        {"event": "freight_delays", "base_prob": 0.5},
+        {"event": "service_disruption", "base_prob": 0.4},
+    ],
+}
+
+# Flattened (event, base_prob) tables, built once at import
+_OUTCOME_TABLES = {
+    vector: tuple((o["event"], o["base_prob"]) for o in outcomes)
+    for vector, outcomes in _OUTCOME_TEMPLATES.items()
+}
+_DEFAULT_OUTCOME_TABLE = (("disruption", 0.3),)
+
 # ============================================================================
 # DATA CLASSES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RawSignal:
     source_id: str
     domain: str
@@ -59,7 +138,7 @@ class RawSignal:
     timestamp: str
     confidence: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NormalizedSignal:
     normalized_id: str
     ontology_path: str
@@ -68,7 +147,7 @@ class NormalizedSignal:
     temporal_marker: str
     source_refs: List[str]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RiskPrimitive:
     risk_vector: str
     signal_confidence: float
@@ -76,6 +155,17 @@ class RiskPrimitive:
     contributing_domains: List[str]
     likely_outcomes: List[str]
     tradability: Dict[str, bool]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form; cheaper than dataclasses.asdict's recursive deepcopy."""
+        return {
+            "risk_vector": self.risk_vector,
+            "signal_confidence": self.signal_confidence,
+            "time_horizon_days": self.time_horizon_days,
+            "contributing_domains": list(self.contributing_domains),
+            "likely_outcomes": list(self.likely_outcomes),
+            "tradability": dict(self.tradability),
+        }
 
 # ============================================================================
 # AGENTS
@@ -126,53 +216,52 @@ class Normalizer:
     """Maps raw signals to unified ontology."""
     
     def normalize(self, signals: List[RawSignal]) -> List[NormalizedSignal]:
-        normalized = []
-        for sig in signals:
-            # Detect ontology path
-            ontology_path = self._detect_ontology(sig.raw_text)
-            signal_type = self._detect_signal_type(sig.raw_text)
-            
-            norm = NormalizedSignal(
-                normalized_id=hashlib.md5(sig.source_id.encode()).hexdigest()[:12],
-                ontology_path=ontology_path,
-                signal_type=signal_type,
-                magnitude=SIGNAL_TYPES.get(signal_type, 0.5) * sig.confidence,
+        # Hoist per-signal lookups into locals for the comprehension
+        id_of = self._id_of
+        classify = self._classify
+        weight = SIGNAL_TYPES.get
+        return [
+            NormalizedSignal(
+                normalized_id=id_of(sig.source_id),
+                ontology_path=(labels := classify(sig.raw_text.lower()))[0],
+                signal_type=labels[1],
+                magnitude=weight(labels[1], 0.5) * sig.confidence,
                 temporal_marker="2026-Q1",
                 source_refs=[sig.source_id]
             )
-            normalized.append(norm)
-        return normalized
+            for sig in signals
+        ]
     
-    def _detect_ontology(self, text: str) -> str:
-        text_lower = text.lower()
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _id_of(source_id: str) -> str:
+        # 6-byte BLAKE2b keeps the 12-hex-char id width of the old MD5 prefix
+        return hashlib.blake2b(source_id.encode(), digest_size=6).hexdigest()
+    
+    # Classification is a pure function of the lowercased text, and harvests
+    # repeat titles and abstracts across runs, so both labels are computed in
+    # one call and memoized together across instances.
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _classify(text_lower: str) -> Tuple[str, str]:
+        return Normalizer._detect_ontology(text_lower), Normalizer._detect_signal_type(text_lower)
+    
+    @staticmethod
+    def _detect_ontology(text_lower: str) -> str:
+        # Track the leader while counting; keywords are grouped by path in
+        # ONTOLOGY order, so strict > keeps the earliest path on ties.
         scores = {}
-        for path, keywords in ONTOLOGY.items():
-            score = sum(1 for kw in keywords if kw in text_lower)
-            if score > 0:
-                scores[path] = score
-        if scores:
-            return max(scores, key=scores.get)
-        return "unknown"
+        best_path, best_score = "unknown", 0
+        for kw, path in _ALL_KWS:
+            if kw in text_lower:
+                score = scores[path] = scores.get(path, 0) + 1
+                if score > best_score:
+                    best_path, best_score = path, score
+        return best_path
     
-    def _detect_signal_type(self, text: str) -> str:
-        text_lower = text.lower()
-        if any(w in text_lower for w in ["defer", "backlog", "delayed", "postpone"]):
-            return "deferral"
-        if any(w in text_lower for w in ["expedite", "emergency", "urgent", "immediate"]):
-            return "acceleration"
-        if any(w in text_lower for w in ["grievance", "complaint", "dispute"]):
-            return "grievance_surge"
-        if any(w in text_lower for w in ["resign", "departure", "exit", "leave"]):
-            return "attrition_spike"
-        if any(w in text_lower for w in ["extension", "consultation", "draft"]):
-            return "language_shift"
-        if any(w in text_lower for w in ["disaster", "fema", "declaration", "declared"]):
-            return "disaster_declaration"
-        if any(w in text_lower for w in ["storm", "hurricane", "tornado", "flood", "blizzard", "ice storm", "winter storm"]):
-            return "weather_event"
-        if any(w in text_lower for w in ["evacuation", "shelter", "rescue", "response"]):
-            return "emergency_response"
-        return "unknown"
+    @staticmethod
+    def _detect_signal_type(text_lower: str) -> str:
+        return next((st for w, st in _SIGNAL_KWS if w in text_lower), "unknown")
 
 
 class Accumulator:
@@ -180,17 +269,20 @@ class Accumulator:
     
     def __init__(self):
         self.belief_states = {}
+        # Evidence per vector in -log(1 - belief) space, where the noisy-OR
+        # update prior + l*(1 - prior) becomes a plain sum of -log(1 - l)
+        self._evidence = {}
     
     def accumulate(self, signals: List[NormalizedSignal]) -> Dict[str, float]:
+        evidence = self._evidence
         for sig in signals:
             vector = sig.ontology_path
-            if vector not in self.belief_states:
-                self.belief_states[vector] = 0.0
-            # Simple Bayesian update (simplified)
-            prior = self.belief_states[vector]
-            likelihood = sig.magnitude
-            posterior = prior + likelihood * (1 - prior)
-            self.belief_states[vector] = min(posterior, 0.99)
+            # Likelihoods are clipped at the belief cap, which keeps log1p
+            # finite and does not change the capped result
+            likelihood = min(max(sig.magnitude, 0.0), MAX_BELIEF)
+            evidence[vector] = evidence.get(vector, 0.0) - math.log1p(-likelihood)
+        for vector, total in evidence.items():
+            self.belief_states[vector] = min(-math.expm1(-total), MAX_BELIEF)
         return self.belief_states
 
 
@@ -212,42 +304,10 @@ class Forecaster:
         return forecasts
     
     def _generate_outcomes(self, vector: str, confidence: float) -> List[Dict]:
-        outcome_templates = {
-            "infra.energy.grid": [
-                {"event": "localized_outage", "base_prob": 0.4},
-                {"event": "price_volatility", "base_prob": 0.3},
-                {"event": "policy_intervention", "base_prob": 0.2},
-            ],
-            "labor.union": [
-                {"event": "work_slowdown", "base_prob": 0.5},
-                {"event": "strike_action", "base_prob": 0.3},
-                {"event": "contract_renegotiation", "base_prob": 0.4},
-            ],
-            "emergency.disaster": [
-                {"event": "infrastructure_damage", "base_prob": 0.6},
-                {"event": "supply_chain_disruption", "base_prob": 0.5},
-                {"event": "insurance_claims_surge", "base_prob": 0.7},
-                {"event": "federal_aid_deployment", "base_prob": 0.4},
-            ],
-            "emergency.weather": [
-                {"event": "travel_disruption", "base_prob": 0.6},
-                {"event": "power_outage", "base_prob": 0.5},
-                {"event": "commodity_price_spike", "base_prob": 0.4},
-            ],
-            "infra.transport.port": [
-                {"event": "shipping_delays", "base_prob": 0.5},
-                {"event": "cargo_rerouting", "base_prob": 0.4},
-                {"event": "supply_shortage", "base_prob": 0.3},
-            ],
-            "infra.transport.rail": [
-                {"event": "freight_delays", "base_prob": 0.5},
-                {"event": "service_disruption", "base_prob": 0.4},
-            ],
-        }
-        templates = outcome_templates.get(vector, [{"event": "disruption", "base_prob": 0.3}])
+        table = _OUTCOME_TABLES.get(vector, _DEFAULT_OUTCOME_TABLE)
         return [
-            {"event": o["event"], "probability": round(o["base_prob"] * confidence, 2)}
-            for o in templates
+            {"event": event, "probability": round(base_prob * confidence, 2)}
+            for event, base_prob in table
         ]
     
     def _estimate_horizon(self, confidence: float) -> str:
@@ -265,13 +325,15 @@ class Packager:
     """Converts to sellable primitives."""
     
     def package(self, forecasts: List[Dict], normalized: List[NormalizedSignal]) -> List[RiskPrimitive]:
+        # Index contributing domains by vector once instead of rescanning
+        # every normalized signal for each forecast
+        domains_by_path = defaultdict(set)
+        for sig in normalized:
+            domains_by_path[sig.ontology_path].add(sig.signal_type)
+        
         primitives = []
         for fc in forecasts:
-            # Find contributing domains
-            domains = set()
-            for sig in normalized:
-                if sig.ontology_path == fc["risk_vector"]:
-                    domains.add(sig.signal_type)
+            domains = domains_by_path.get(fc["risk_vector"], ())
             
             primitive = RiskPrimitive(
                 risk_vector=fc["risk_vector"],
@@ -285,17 +347,14 @@ class Packager:
         return primitives
     
     def _assess_tradability(self, vector: str) -> Dict[str, bool]:
-        tradability_map = {
-            "infra.energy": {"insurance": True, "commodities": True, "logistics": True, "policy": True},
-            "infra.transport": {"insurance": True, "commodities": False, "logistics": True, "policy": False},
-            "labor": {"insurance": False, "commodities": False, "logistics": True, "policy": True},
-            "legal": {"insurance": True, "commodities": False, "logistics": False, "policy": True},
-            "supply": {"insurance": False, "commodities": True, "logistics": True, "policy": False},
-        }
-        for prefix, trad in tradability_map.items():
-            if vector.startswith(prefix):
-                return trad
-        return {"insurance": False, "commodities": False, "logistics": False, "policy": False}
+        # Longest dotted-prefix match: "infra.energy.grid" -> "infra.energy" -> "infra"
+        prefix = vector
+        while prefix:
+            trad = TRADABILITY_MAP.get(prefix)
+            if trad is not None:
+                return dict(trad)
+            prefix = prefix.rpartition(".")[0]
+        return dict(_NO_TRADABILITY)
 
 
 # ============================================================================
@@ -351,9 +410,9 @@ def run_blacksnow_pipeline():
     print("=" * 60)
     print("OUTPUT: Risk Primitives")
     print("=" * 60)
-    for prim in primitives:
-        print(json.dumps(asdict(prim), indent=2))
-        print()
+    # One encoder and a single write for the whole batch
+    encoder = json.JSONEncoder(indent=2)
+    sys.stdout.write("".join(encoder.encode(prim.to_dict()) + "\n\n" for prim in primitives))
     
     return primitives
 
@@ -5,14 +5,19 @@ Connects to real public data sources for ambient risk signals.
 """
 
 import json
+import sys
 import hashlib
+import os
 import re
+import time
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict
 import urllib.request
 import urllib.error
 import ssl
+from concurrent.futures import ThreadPoolExecutor
 
 # ============================================================================
 # CONFIG
@@ -39,11 +44,56 @@ SOURCES = {
     }
 }
 
+# Upper bound on concurrent harvester fetches, to avoid hammering remote APIs
+MAX_HARVEST_WORKERS = 8
+
+# On-disk response cache for live sources that change slowly
+CACHE_DIR = Path.home() / ".cache" / "blacksnow"
+FEDREG_CACHE_TTL = 3600  # seconds
+
+# Shared TLS context for every harvester fetch, built once at import.
+# Certificate verification stays off, as it always has for these fetches: every
+# source is a public, unauthenticated read and no credentials are sent. Restore
+# check_hostname/CERT_REQUIRED before adding any keyed source (e.g. SAM.gov).
+SSL_CONTEXT = ssl.create_default_context()
+SSL_CONTEXT.check_hostname = False
+SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
+# ============================================================================
+# RESPONSE CACHE
+# ============================================================================
+
+def _cache_path(url: str) -> Path:
+    return CACHE_DIR / f"{hashlib.blake2b(url.encode(), digest_size=8).hexdigest()}.json"
+
+
+def read_cached(url: str, ttl: int) -> Optional[bytes]:
+    """Return the cached body for url if it is younger than ttl seconds."""
+    path = _cache_path(url)
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            return path.read_bytes()
+    except OSError:
+        pass
+    return None
+
+
+def write_cached(url: str, body: bytes):
+    """Store a response body for url, replacing any previous entry atomically."""
+    path = _cache_path(url)
+    tmp = path.with_suffix(".tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(body)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[WARN] Cache write failed for {url[:50]}...: {e}")
+
 # ============================================================================
 # DATA CLASSES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class RawSignal:
     source_id: str
     source_name: str
@@ -63,10 +113,18 @@ class FederalRegisterHarvester:
     """Harvests from Federal Register API (no key required)."""
     
     BASE_URL = "https://www.federalregister.gov/api/v1/documents.json"
+    # Relevance filter, matched as substrings of the lowercased title+abstract
+    DEFAULT_KEYWORDS = ("grid", "energy", "infrastructure", "emergency", "defer")
     
     def harvest(self, keywords: List[str] = None, days_back: int = 7) -> List[RawSignal]:
+        # Prepare the filter once per call rather than per document
         if keywords is None:
-            keywords = ["grid", "energy", "infrastructure", "emergency", "defer"]
+            keywords = self.DEFAULT_KEYWORDS
+        else:
+            keywords = tuple(kw.lower() for kw in keywords)
+        # A keyword without a space cannot straddle the title/abstract join, so
+        # such keyword sets are tested per field without building the joined string
+        per_field = not any(" " in kw for kw in keywords)
         
         signals = []
         
@@ -81,22 +139,32 @@ class FederalRegisterHarvester:
         url = f"{self.BASE_URL}?{query}"
         
         try:
-            ctx = ssl.create_default_context()
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
+            body = read_cached(url, FEDREG_CACHE_TTL)
+            cached = body is not None
+            if not cached:
+                req = urllib.request.Request(url, headers={"User-Agent": "BlackSnow/0.1"})
+                with urllib.request.urlopen(req, timeout=10, context=SSL_CONTEXT) as response:
+                    body = response.read()
             
-            req = urllib.request.Request(url, headers={"User-Agent": "BlackSnow/0.1"})
-            with urllib.request.urlopen(req, timeout=10, context=ctx) as response:
-                data = json.loads(response.read().decode())
-                
+            data = json.loads(body)
+            if not cached:
+                write_cached(url, body)
+            
+            now = datetime.now(timezone.utc).isoformat()  # fallback stamp, shared by the batch
             for doc in data.get("results", []):
                 title = doc.get("title", "")
                 abstract = doc.get("abstract", "") or ""
                 
                 # Check keyword relevance
-                text_lower = (title + " " + abstract).lower()
-                if not any(kw in text_lower for kw in keywords):
-                    continue
+                if per_field:
+                    title_lower = title.lower()
+                    abstract_lower = abstract.lower()
+                    if not any(kw in title_lower or kw in abstract_lower for kw in keywords):
+                        continue
+                else:
+                    text_lower = (title + " " + abstract).lower()
+                    if not any(kw in text_lower for kw in keywords):
+                        continue
                 
                 signal = RawSignal(
                     source_id=f"fedreg:{doc.get('document_number', 'unknown')}",
@@ -105,7 +173,7 @@ class FederalRegisterHarvester:
                     title=title[:200],
                     raw_text=abstract[:1000] if abstract else title,
                     url=doc.get("html_url", ""),
-                    timestamp=doc.get("publication_date", datetime.now(timezone.utc).isoformat()),
+                    timestamp=doc.get("publication_date") or now,
                     confidence=0.85,
                     metadata={
                         "type": doc.get("type"),
@@ -126,6 +194,7 @@ class MockProcurementHarvester:
     
     def harvest(self) -> List[RawSignal]:
         # Return realistic mock data
+        now = datetime.now(timezone.utc).isoformat()
         return [
             RawSignal(
                 source_id="sam:opp:2026-02-07:grid-maint-northeast",
@@ -134,7 +203,7 @@ class MockProcurementHarvester:
                 title="Emergency Grid Maintenance - Northeast Region",
                 raw_text="Solicitation for emergency maintenance services for transmission infrastructure. Expedited timeline due to deferred Q4 maintenance backlog. Critical infrastructure designation.",
                 url="https://sam.gov/opp/example",
-                timestamp=datetime.now(timezone.utc).isoformat(),
+                timestamp=now,
                 confidence=0.92,
                 metadata={"naics": "237130", "set_aside": "none", "value_range": "1M-5M"}
             ),
@@ -145,7 +214,7 @@ class MockProcurementHarvester:
                 title="Port Security Infrastructure Upgrade - Gulf Coast",
                 raw_text="Request for proposals for security system upgrades at major port facilities. Accelerated timeline requested by DHS.",
                 url="https://sam.gov/opp/example2",
-                timestamp=datetime.now(timezone.utc).isoformat(),
+                timestamp=now,
                 confidence=0.88,
                 metadata={"naics": "561621", "set_aside": "small_business", "value_range": "500K-1M"}
             )
@@ -156,6 +225,7 @@ class MockLaborHarvester:
     """Mock harvester for labor/union data."""
     
     def harvest(self) -> List[RawSignal]:
+        now = datetime.now(timezone.utc).isoformat()
         return [
             RawSignal(
                 source_id="nlrb:case:2026-02-05:grievance-1923",
@@ -164,7 +234,7 @@ class MockLaborHarvester:
                 title="Collective Bargaining Grievance - Utility Sector",
                 raw_text="Union files grievance regarding mandatory overtime policies and safety protocol modifications at regional power generation facility.",
                 url="https://nlrb.gov/case/example",
-                timestamp=datetime.now(timezone.utc).isoformat(),
+                timestamp=now,
                 confidence=0.87,
                 metadata={"sector": "utilities", "region": "midwest", "grievance_type": "safety"}
             )
@@ -176,31 +246,26 @@ class MockLaborHarvester:
 # ============================================================================
 
 def harvest_all_sources() -> List[RawSignal]:
-    """Run all harvesters and collect signals."""
+    """Run all harvesters concurrently and collect signals."""
     all_signals = []
     
-    print("[HARVESTER] Starting live data collection...")
-    
-    # Federal Register (live)
-    print("  → Federal Register...")
-    fr_harvester = FederalRegisterHarvester()
-    fr_signals = fr_harvester.harvest()
-    print(f"    Found {len(fr_signals)} signals")
-    all_signals.extend(fr_signals)
+    harvesters = [
+        ("Federal Register", FederalRegisterHarvester()),   # live
+        ("SAM.gov (mock)", MockProcurementHarvester()),     # needs API key
+        ("NLRB (mock)", MockLaborHarvester()),
+    ]
     
-    # SAM.gov (mock - needs API key)
-    print("  → SAM.gov (mock)...")
-    proc_harvester = MockProcurementHarvester()
-    proc_signals = proc_harvester.harvest()
-    print(f"    Found {len(proc_signals)} signals")
-    all_signals.extend(proc_signals)
+    print("[HARVESTER] Starting live data collection...")
     
-    # NLRB (mock)
-    print("  → NLRB (mock)...")
-    labor_harvester = MockLaborHarvester()
-    labor_signals = labor_harvester.harvest()
-    print(f"    Found {len(labor_signals)} signals")
-    all_signals.extend(labor_signals)
+    # Harvests block on network I/O, so overlap them: wall time is bounded by
+    # the slowest source rather than the sum. Results are reported in order.
+    with ThreadPoolExecutor(max_workers=min(MAX_HARVEST_WORKERS, len(harvesters))) as pool:
+        futures = [(name, pool.submit(h.harvest)) for name, h in harvesters]
+        for name, future in futures:
+            print(f"  → {name}...")
+            signals = future.result()
+            print(f"    Found {len(signals)} signals")
+            all_signals.extend(signals)
     
     print(f"[HARVESTER] Total: {len(all_signals)} raw signals collected")
     return all_signals
@@ -211,6 +276,6 @@ if __name__ == "__main__":
     print("\n" + "="*60)
     print("RAW SIGNALS")
     print("="*60)
-    for sig in signals:
-        print(json.dumps(asdict(sig), indent=2, default=str))
-        print()
+    # One encoder and a single write for the whole batch
+    encoder = json.JSONEncoder(indent=2, default=str)
+    sys.stdout.write("".join(encoder.encode(asdict(sig)) + "\n\n" for sig in signals))
@@ -6,10 +6,14 @@ Stores signals and risk primitives in workspace memory for longitudinal analysis
 
 import json
 import os
+import sqlite3
+from heapq import nlargest
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from dataclasses import asdict
+from dataclasses import fields
+from functools import lru_cache
+from operator import attrgetter
 
 # ============================================================================
 # CONFIG
@@ -19,6 +23,31 @@ BLACKSNOW_DIR = Path.home() / ".openclaw" / "blacksnow"
 SIGNALS_DIR = BLACKSNOW_DIR / "signals"
 VECTORS_DIR = BLACKSNOW_DIR / "vectors"
 STATE_FILE = BLACKSNOW_DIR / "state.json"
+DB_FILE = BLACKSNOW_DIR / "blacksnow.db"  # belief history
+
+# Per-vector belief samples kept (and returned) for drift detection
+BELIEF_HISTORY_LIMIT = 100
+
+# Shared compact encoder/decoder for JSONL records
+_ENCODER = json.JSONEncoder(default=str)
+_DECODER = json.JSONDecoder()
+
+@lru_cache(maxsize=None)
+def _field_extractor(cls):
+    """(names, getter) pair reading all dataclass fields of cls in one call."""
+    names = tuple(f.name for f in fields(cls))
+    getter = attrgetter(*names)
+    if len(names) == 1:
+        return names, lambda obj: (getter(obj),)
+    return names, getter
+
+
+def _to_record(item) -> Dict:
+    """Shallow dict of a dataclass instance, or the item itself if already a dict."""
+    if not hasattr(item, '__dataclass_fields__'):
+        return item
+    names, getter = _field_extractor(type(item))
+    return dict(zip(names, getter(item)))
 
 # ============================================================================
 # MEMORY MANAGER
@@ -27,9 +56,16 @@ STATE_FILE = BLACKSNOW_DIR / "state.json"
 class BlackSnowMemory:
     """Manages persistent storage for BlackSnow signals and vectors."""
     
-    def __init__(self):
+    def __init__(self, autosave: bool = True):
+        # With autosave off, updates only mark the state dirty and the caller
+        # persists once via flush() (e.g. at the end of a pipeline run).
+        self.autosave = autosave
+        self._dirty = False
+        self._handles = {}  # file prefix -> (date, open append handle)
         self._ensure_dirs()
         self.state = self._load_state()
+        self._db = self._open_db()
+        self._migrate_belief_history()
     
     def _ensure_dirs(self):
         """Create storage directories if they don't exist."""
@@ -51,9 +87,64 @@ class BlackSnowMemory:
         }
     
     def _save_state(self):
-        """Persist state to disk."""
-        with open(STATE_FILE, 'w') as f:
+        """Persist state to disk, or defer it until flush() when autosave is off."""
+        self._dirty = True
+        if self.autosave:
+            self.flush()
+    
+    def flush(self):
+        """Write pending state changes; tmpfile + rename so a crash never truncates it."""
+        if not self._dirty:
+            return
+        tmp = STATE_FILE.with_suffix(".json.tmp")
+        with open(tmp, 'w') as f:
             json.dump(self.state, f, indent=2, default=str)
+        os.replace(tmp, STATE_FILE)
+        self._dirty = False
+    
+    def _daily_handle(self, directory: Path, prefix: str, date: str):
+        """Append handle for <prefix><date>.jsonl, kept open until the date rolls over."""
+        cached = self._handles.get(prefix)
+        if cached is not None:
+            if cached[0] == date:
+                return cached[1]
+            cached[1].close()
+        fh = open(directory / f"{prefix}{date}.jsonl", 'a')
+        self._handles[prefix] = (date, fh)
+        return fh
+    
+    @staticmethod
+    def _append_jsonl(fh, items: List[Any], stamp_key: str, stamp: str) -> int:
+        """Serialize items as stamped JSON lines and append them in one write."""
+        lines = []
+        for item in items:
+            record = _to_record(item)
+            record[stamp_key] = stamp
+            lines.append(_ENCODER.encode(record) + "\n")
+        
+        fh.writelines(lines)
+        fh.flush()  # readers (get_signals/get_vectors) open the file separately
+        return len(lines)
+    
+    @staticmethod
+    def _daily_files(directory: Path, prefix: str) -> List[str]:
+        """Names of the <prefix>YYYY-MM-DD.jsonl files in directory."""
+        with os.scandir(directory) as it:
+            return [e.name for e in it
+                    if e.name.startswith(prefix) and e.name.endswith(".jsonl")]
+    
+    @classmethod
+    def _latest_daily_files(cls, directory: Path, prefix: str, count: int) -> List[Path]:
+        """Paths of the newest count daily files, newest first."""
+        # ISO dates in the names make lexical order chronological
+        return [directory / name for name in nlargest(count, cls._daily_files(directory, prefix))]
+    
+    @staticmethod
+    def _read_jsonl(filepath: Path) -> List[Dict]:
+        """Parse every non-blank line of a JSONL file."""
+        decode = _DECODER.decode
+        with open(filepath, 'r') as f:
+            return [decode(line) for line in f if not line.isspace()]
     
     # ========================================================================
     # SIGNALS
@@ -61,19 +152,12 @@ class BlackSnowMemory:
     
     def store_signals(self, signals: List[Any]) -> int:
         """Store raw signals to daily file."""
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        filepath = SIGNALS_DIR / f"signals_{today}.jsonl"
-        
-        stored = 0
-        with open(filepath, 'a') as f:
-            for sig in signals:
-                record = asdict(sig) if hasattr(sig, '__dataclass_fields__') else sig
-                record["_stored_at"] = datetime.now(timezone.utc).isoformat()
-                f.write(json.dumps(record, default=str) + "\n")
-                stored += 1
+        now = datetime.now(timezone.utc)
+        fh = self._daily_handle(SIGNALS_DIR, "signals_", now.strftime("%Y-%m-%d"))
+        stored = self._append_jsonl(fh, signals, "_stored_at", now.isoformat())
         
         self.state["total_signals"] += stored
-        self.state["last_harvest"] = datetime.now(timezone.utc).isoformat()
+        self.state["last_harvest"] = now.isoformat()
         self._save_state()
         
         return stored
@@ -81,11 +165,8 @@ class BlackSnowMemory:
     def get_signals(self, days_back: int = 7) -> List[Dict]:
         """Retrieve signals from recent days."""
         signals = []
-        for filepath in sorted(SIGNALS_DIR.glob("signals_*.jsonl"), reverse=True)[:days_back]:
-            with open(filepath, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        signals.append(json.loads(line))
+        for filepath in self._latest_daily_files(SIGNALS_DIR, "signals_", days_back):
+            signals.extend(self._read_jsonl(filepath))
         return signals
     
     # ========================================================================
@@ -94,16 +175,9 @@ class BlackSnowMemory:
     
     def store_vectors(self, vectors: List[Any]) -> int:
         """Store risk primitives to daily file."""
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        filepath = VECTORS_DIR / f"vectors_{today}.jsonl"
-        
-        stored = 0
-        with open(filepath, 'a') as f:
-            for vec in vectors:
-                record = asdict(vec) if hasattr(vec, '__dataclass_fields__') else vec
-                record["_generated_at"] = datetime.now(timezone.utc).isoformat()
-                f.write(json.dumps(record, default=str) + "\n")
-                stored += 1
+        now = datetime.now(timezone.utc)
+        fh = self._daily_handle(VECTORS_DIR, "vectors_", now.strftime("%Y-%m-%d"))
+        stored = self._append_jsonl(fh, vectors, "_generated_at", now.isoformat())
         
         self.state["total_vectors"] += stored
         self._save_state()
@@ -113,45 +187,96 @@ class BlackSnowMemory:
     def get_vectors(self, days_back: int = 30) -> List[Dict]:
         """Retrieve vectors from recent days."""
         vectors = []
-        for filepath in sorted(VECTORS_DIR.glob("vectors_*.jsonl"), reverse=True)[:days_back]:
-            with open(filepath, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        vectors.append(json.loads(line))
+        for filepath in self._latest_daily_files(VECTORS_DIR, "vectors_", days_back):
+            vectors.extend(self._read_jsonl(filepath))
         return vectors
     
     # ========================================================================
     # BELIEF STATES (Longitudinal)
     # ========================================================================
     
+    def _open_db(self) -> sqlite3.Connection:
+        """Open the belief-history database in WAL mode, creating the schema."""
+        conn = sqlite3.connect(DB_FILE)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS belief_history ("
+            "vector TEXT NOT NULL, timestamp TEXT NOT NULL, value REAL NOT NULL)"
+        )
+        # rowid is insertion (= chronological) order, and every index carries it
+        conn.execute("CREATE INDEX IF NOT EXISTS belief_history_vector ON belief_history (vector)")
+        return conn
+    
+    def _migrate_belief_history(self):
+        """Move histories kept inline in state.json into the database."""
+        migrated = False
+        rows = []
+        for vector, entry in self.state["belief_states"].items():
+            if "history" not in entry:
+                continue
+            migrated = True
+            points = entry.pop("history")[-BELIEF_HISTORY_LIMIT:]
+            # Rows already present mean an earlier run committed this vector but
+            # died before rewriting state.json; importing again would duplicate them
+            if self._db.execute(
+                "SELECT 1 FROM belief_history WHERE vector = ? LIMIT 1", (vector,)
+            ).fetchone() is None:
+                rows.extend((vector, point["timestamp"], point["value"]) for point in points)
+        
+        if rows:
+            with self._db:
+                self._db.executemany("INSERT INTO belief_history VALUES (?, ?, ?)", rows)
+        if migrated:
+            self._dirty = True
+            self.flush()
+    
+    def _prune_belief_history(self, vectors):
+        """Keep only the newest BELIEF_HISTORY_LIMIT rows for each given vector."""
+        self._db.executemany(
+            "DELETE FROM belief_history WHERE vector = ? AND rowid < ("
+            "SELECT MIN(rowid) FROM (SELECT rowid FROM belief_history "
+            "WHERE vector = ? ORDER BY rowid DESC LIMIT ?))",
+            [(vector, vector, BELIEF_HISTORY_LIMIT) for vector in vectors],
+        )
+    
     def update_belief_states(self, belief_states: Dict[str, float]):
         """Update and persist belief states for drift detection."""
+        # state.json keeps only the current value; samples go to the database
+        states = self.state["belief_states"]
+        now = datetime.now(timezone.utc).isoformat()
+        rows = []
         for vector, belief in belief_states.items():
-            if vector not in self.state["belief_states"]:
-                self.state["belief_states"][vector] = {
-                    "history": [],
-                    "current": belief
-                }
-            
-            # Append to history
-            self.state["belief_states"][vector]["history"].append({
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "value": belief
-            })
-            
-            # Keep last 100 entries
-            self.state["belief_states"][vector]["history"] = \
-                self.state["belief_states"][vector]["history"][-100:]
-            
-            self.state["belief_states"][vector]["current"] = belief
+            states[vector] = {"current": belief}
+            rows.append((vector, now, belief))
         
+        with self._db:
+            self._db.executemany("INSERT INTO belief_history VALUES (?, ?, ?)", rows)
+            self._prune_belief_history(belief_states)
         self._save_state()
     
     def get_belief_history(self, vector: str) -> List[Dict]:
-        """Get historical belief values for a vector."""
-        if vector in self.state["belief_states"]:
-            return self.state["belief_states"][vector]["history"]
-        return []
+        """Get the last BELIEF_HISTORY_LIMIT belief values for a vector, oldest first."""
+        rows = self._db.execute(
+            "SELECT timestamp, value FROM belief_history WHERE vector = ? "
+            "ORDER BY rowid DESC LIMIT ?",
+            (vector, BELIEF_HISTORY_LIMIT),
+        ).fetchall()
+        return [{"timestamp": ts, "value": value} for ts, value in reversed(rows)]
+    
+    def close(self):
+        """Flush pending state and close the database and daily file handles."""
+        self.flush()
+        self._db.close()
+        for _, fh in self._handles.values():
+            fh.close()
+        self._handles.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
     
     # ========================================================================
     # STATUS
@@ -159,13 +284,10 @@ class BlackSnowMemory:
     
     def get_status(self) -> Dict:
         """Return memory status summary."""
-        signal_files = list(SIGNALS_DIR.glob("signals_*.jsonl"))
-        vector_files = list(VECTORS_DIR.glob("vectors_*.jsonl"))
-        
         return {
             "storage_path": str(BLACKSNOW_DIR),
-            "signal_files": len(signal_files),
-            "vector_files": len(vector_files),
+            "signal_files": len(self._daily_files(SIGNALS_DIR, "signals_")),
+            "vector_files": len(self._daily_files(VECTORS_DIR, "vectors_")),
             "total_signals": self.state["total_signals"],
             "total_vectors": self.state["total_vectors"],
             "tracked_vectors": list(self.state["belief_states"].keys()),
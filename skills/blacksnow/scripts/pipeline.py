@@ -6,6 +6,7 @@ Integrates harvester, normalizer, accumulator, forecaster, packager, memory, and
 
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -40,145 +41,130 @@ def run_full_pipeline(webhook_url: str = None, verbose: bool = True) -> dict:
         "webhook": None
     }
     
-    # Initialize memory
-    memory = BlackSnowMemory()
-    
-    # 1. Harvest
-    if verbose:
-        print("=" * 60)
-        print("BLACKSNOW FULL PIPELINE")
-        print("=" * 60)
-        print("\n[1/7] HARVEST: Collecting live signals...")
-    
-    # Harvest from both basic and extended sources
-    raw_signals = harvest_all_sources()
-    extended_signals = harvest_all_extended()
-    raw_signals.extend(extended_signals)
-    
-    results["stages"]["harvest"] = {"count": len(raw_signals)}
-    
-    # Store raw signals
-    stored_signals = memory.store_signals(raw_signals)
-    if verbose:
-        print(f"      Stored {stored_signals} signals to memory")
-    
-    # 2. Normalize
-    if verbose:
-        print("\n[2/7] NORMALIZE: Aligning to ontology...")
-    
-    normalizer = Normalizer()
-    # Convert harvested signals to format normalizer expects
-    from dataclasses import dataclass
-    
-    @dataclass
-    class RawSig:
-        source_id: str
-        domain: str
-        raw_text: str
-        timestamp: str
-        confidence: float
-    
-    normalized_input = [
-        RawSig(
-            source_id=s.source_id,
-            domain=s.domain,
-            raw_text=s.raw_text,
-            timestamp=s.timestamp,
-            confidence=s.confidence
-        ) for s in raw_signals
-    ]
-    
-    normalized = normalizer.normalize(normalized_input)
-    results["stages"]["normalize"] = {"count": len(normalized)}
-    
-    if verbose:
-        for norm in normalized:
-            print(f"      - {norm.ontology_path} | {norm.signal_type} | mag={norm.magnitude:.2f}")
-    
-    # 3. Accumulate
-    if verbose:
-        print("\n[3/7] ACCUMULATE: Bayesian evidence stacking...")
-    
-    accumulator = Accumulator()
-    belief_states = accumulator.accumulate(normalized)
-    results["stages"]["accumulate"] = {"vectors": dict(belief_states)}
-    
-    # Update persistent belief states
-    memory.update_belief_states(belief_states)
-    
-    if verbose:
-        for vector, belief in belief_states.items():
-            print(f"      - {vector}: {belief:.2f}")
-    
-    # 4. Forecast
-    if verbose:
-        print("\n[4/7] FORECAST: Horizon modeling...")
-    
-    forecaster = Forecaster()
-    forecasts = forecaster.forecast(belief_states)
-    results["stages"]["forecast"] = {"count": len(forecasts)}
-    
-    if verbose:
-        for fc in forecasts:
-            print(f"      - {fc['risk_vector']}: horizon={fc['time_horizon_days']}d, conf={fc['confidence']}")
-    
-    # 5. Package
-    if verbose:
-        print("\n[5/7] PACKAGE: Generating tradable primitives...")
-    
-    packager = Packager()
-    primitives = packager.package(forecasts, normalized)
-    results["stages"]["package"] = {"count": len(primitives)}
-    
-    # 6. Store vectors
-    if verbose:
-        print("\n[6/7] PERSIST: Storing to workspace memory...")
-    
-    stored_vectors = memory.store_vectors(primitives)
-    results["stages"]["persist"] = {"stored": stored_vectors}
-    
-    if verbose:
-        print(f"      Stored {stored_vectors} risk primitives")
-    
-    # 7. Webhook (optional)
-    if webhook_url:
+    # Initialize memory; state.json is written once after the persist stage, and
+    # leaving the block flushes and closes it even if a later stage raises
+    with BlackSnowMemory(autosave=False) as memory:
+        # 1. Harvest
         if verbose:
-            print(f"\n[7/7] WEBHOOK: Pushing to {webhook_url}...")
+            print("=" * 60)
+            print("BLACKSNOW FULL PIPELINE")
+            print("=" * 60)
+            print("\n[1/7] HARVEST: Collecting live signals...")
+        
+        # Harvest from both basic and extended sources. Each set already fans out
+        # over its own sources; running the two side by side overlaps their slowest
+        # fetches too (progress lines from the two sets may interleave).
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            basic = pool.submit(harvest_all_sources)
+            extended = pool.submit(harvest_all_extended)
+            raw_signals = basic.result()
+            raw_signals.extend(extended.result())
         
-        from webhook import WebhookConfig, WebhookDelivery
-        config = WebhookConfig(url=webhook_url, tier="operator")
-        delivery = WebhookDelivery(config)
-        webhook_result = delivery.deliver(primitives)
-        results["webhook"] = webhook_result
+        results["stages"]["harvest"] = {"count": len(raw_signals)}
         
+        # Store raw signals
+        stored_signals = memory.store_signals(raw_signals)
         if verbose:
-            if webhook_result["success"]:
-                print(f"      ✓ Delivered {webhook_result['primitives_sent']} primitives")
-            else:
-                print(f"      ✗ Failed: {webhook_result['error']}")
-    else:
+            print(f"      Stored {stored_signals} signals to memory")
+        
+        # 2. Normalize
         if verbose:
-            print("\n[7/7] WEBHOOK: Skipped (no URL configured)")
-    
-    # Convert primitives to dict for output
-    from dataclasses import asdict
-    results["primitives"] = [asdict(p) for p in primitives]
-    
-    # Summary
-    if verbose:
-        print("\n" + "=" * 60)
-        print("PIPELINE COMPLETE")
-        print("=" * 60)
-        print(f"Signals harvested: {len(raw_signals)}")
-        print(f"Vectors detected:  {len(belief_states)}")
-        print(f"Primitives output: {len(primitives)}")
-        print()
+            print("\n[2/7] NORMALIZE: Aligning to ontology...")
+        
+        normalizer = Normalizer()
+        # Harvested RawSignals carry every field the normalizer reads
+        # (source_id, raw_text, confidence), so they are passed through as-is
+        normalized = normalizer.normalize(raw_signals)
+        results["stages"]["normalize"] = {"count": len(normalized)}
+        
+        if verbose:
+            for norm in normalized:
+                print(f"      - {norm.ontology_path} | {norm.signal_type} | mag={norm.magnitude:.2f}")
+        
+        # 3. Accumulate
+        if verbose:
+            print("\n[3/7] ACCUMULATE: Bayesian evidence stacking...")
+        
+        accumulator = Accumulator()
+        belief_states = accumulator.accumulate(normalized)
+        results["stages"]["accumulate"] = {"vectors": dict(belief_states)}
+        
+        # Update persistent belief states
+        memory.update_belief_states(belief_states)
+        
+        if verbose:
+            for vector, belief in belief_states.items():
+                print(f"      - {vector}: {belief:.2f}")
+        
+        # 4. Forecast
+        if verbose:
+            print("\n[4/7] FORECAST: Horizon modeling...")
+        
+        forecaster = Forecaster()
+        forecasts = forecaster.forecast(belief_states)
+        results["stages"]["forecast"] = {"count": len(forecasts)}
+        
+        if verbose:
+            for fc in forecasts:
+                print(f"      - {fc['risk_vector']}: horizon={fc['time_horizon_days']}d, conf={fc['confidence']}")
+        
+        # 5. Package
+        if verbose:
+            print("\n[5/7] PACKAGE: Generating tradable primitives...")
+        
+        packager = Packager()
+        primitives = packager.package(forecasts, normalized)
+        results["stages"]["package"] = {"count": len(primitives)}
+        
+        # 6. Store vectors
+        if verbose:
+            print("\n[6/7] PERSIST: Storing to workspace memory...")
+        
+        stored_vectors = memory.store_vectors(primitives)
+        memory.flush()
+        results["stages"]["persist"] = {"stored": stored_vectors}
+        
+        if verbose:
+            print(f"      Stored {stored_vectors} risk primitives")
+        
+        # 7. Webhook (optional)
+        if webhook_url:
+            if verbose:
+                print(f"\n[7/7] WEBHOOK: Pushing to {webhook_url}...")
+        
+            from webhook import WebhookConfig, WebhookDelivery
+            config = WebhookConfig(url=webhook_url, tier="operator")
+            delivery = WebhookDelivery(config)
+            webhook_result = delivery.deliver(primitives)
+            results["webhook"] = webhook_result
+        
+            if verbose:
+                if webhook_result["success"]:
+                    print(f"      ✓ Delivered {webhook_result['primitives_sent']} primitives")
+                else:
+                    print(f"      ✗ Failed: {webhook_result['error']}")
+        else:
+            if verbose:
+                print("\n[7/7] WEBHOOK: Skipped (no URL configured)")
+        
+        # Convert primitives to dict for output
+        results["primitives"] = [p.to_dict() for p in primitives]
+        
+        # Summary
+        if verbose:
+            print("\n" + "=" * 60)
+            print("PIPELINE COMPLETE")
+            print("=" * 60)
+            print(f"Signals harvested: {len(raw_signals)}")
+            print(f"Vectors detected:  {len(belief_states)}")
+            print(f"Primitives output: {len(primitives)}")
+            print()
+        
+            # Memory status
+            status = memory.get_status()
+            print(f"Memory: {status['total_signals']} total signals, {status['total_vectors']} total vectors")
+            print(f"Storage: {status['storage_path']}")
         
-        # Memory status
-        status = memory.get_status()
-        print(f"Memory: {status['total_signals']} total signals, {status['total_vectors']} total vectors")
-        print(f"Storage: {status['storage_path']}")
-    
     return results
 
 
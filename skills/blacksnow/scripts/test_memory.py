@@ -0,0 +1,79 @@
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import memory
+from memory import BlackSnowMemory, BELIEF_HISTORY_LIMIT
+
+def _use_storage(root):
+    """Point the module's storage paths at a scratch directory."""
+    memory.BLACKSNOW_DIR = root
+    memory.SIGNALS_DIR = root / "signals"
+    memory.VECTORS_DIR = root / "vectors"
+    memory.STATE_FILE = root / "state.json"
+    memory.DB_FILE = root / "blacksnow.db"
+
+def _write_legacy_state(points, short_points):
+    state = {
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "last_harvest": None,
+        "total_signals": 0,
+        "total_vectors": 0,
+        "belief_states": {
+            "infra.energy.grid": {"current": 0.5, "history": points},
+            "finance.credit.stress": {"current": 0.2, "history": short_points},
+        },
+    }
+    memory.STATE_FILE.write_text(json.dumps(state))
+
+def run_tests():
+    saved = {name: getattr(memory, name) for name in
+             ("BLACKSNOW_DIR", "SIGNALS_DIR", "VECTORS_DIR", "STATE_FILE", "DB_FILE")}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            _use_storage(Path(tmp))
+            memory.BLACKSNOW_DIR.mkdir(exist_ok=True)
+            points = [{"timestamp": f"t{i:03d}", "value": i / 150} for i in range(150)]
+            short_points = points[:30]  # under the cap, so pruning cannot hide duplicates
+            _write_legacy_state(points, short_points)
+
+            # A 150-point inline history migrates down to the newest 100, oldest first
+            with BlackSnowMemory() as mem:
+                history = mem.get_belief_history("infra.energy.grid")
+            assert len(history) == BELIEF_HISTORY_LIMIT
+            assert [p["timestamp"] for p in history] == [p["timestamp"] for p in points[-BELIEF_HISTORY_LIMIT:]]
+            state = json.loads(memory.STATE_FILE.read_text())
+            assert state["belief_states"]["infra.energy.grid"] == {"current": 0.5}
+            print(f"Migration -> {len(history)} rows, {history[0]['timestamp']}..{history[-1]['timestamp']}")
+
+            # Crash after the database commit but before state.json was rewritten:
+            # the re-run must not import the history a second time
+            _write_legacy_state(points, short_points)
+            with BlackSnowMemory() as mem:
+                rows = mem._db.execute("SELECT COUNT(*) FROM belief_history").fetchone()[0]
+                assert rows == BELIEF_HISTORY_LIMIT + len(short_points), rows
+                assert mem.get_belief_history("finance.credit.stress") == short_points
+                assert mem.get_belief_history("infra.energy.grid") == history
+                assert "history" not in mem.state["belief_states"]["infra.energy.grid"]
+            print("Re-run after interrupted migration -> no duplicate rows")
+
+            # New samples keep the table capped per vector
+            with BlackSnowMemory() as mem:
+                mem.update_belief_states({"infra.energy.grid": 0.9})
+                history = mem.get_belief_history("infra.energy.grid")
+                rows = mem._db.execute(
+                    "SELECT COUNT(*) FROM belief_history WHERE vector = ?", ("infra.energy.grid",)
+                ).fetchone()[0]
+            assert rows == BELIEF_HISTORY_LIMIT and history[-1]["value"] == 0.9
+            assert history[0]["timestamp"] == points[-BELIEF_HISTORY_LIMIT + 1]["timestamp"]
+            print("Update -> oldest sample pruned")
+    finally:
+        for name, value in saved.items():
+            setattr(memory, name, value)
+    print("All memory tests passed.")
+
+if __name__ == "__main__":
+    run_tests()
@@ -5,11 +5,17 @@ Pushes risk primitives to external systems via webhooks.
 """
 
 import json
-import urllib.request
+import http.client
+import threading
+import time
+import uuid
 import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
 import hmac
 
@@ -17,12 +23,49 @@ import hmac
 # CONFIG
 # ============================================================================
 
+# Encoders built once: compact for the wire, canonical (sorted) for stream ids
+_PAYLOAD_ENCODER = json.JSONEncoder(separators=(",", ":"), default=str)
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True)
+
+# Upper bound on concurrent endpoint deliveries in WebhookManager.deliver_all
+MAX_DELIVERY_WORKERS = 16
+
+# Per-request socket timeout, and retry policy for transient gateway errors
+DELIVERY_TIMEOUT = 30
+DELIVERY_RETRIES = 3
+RETRY_BACKOFF = 0.3  # seconds, doubled per attempt
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+# Primitives serialized per body chunk; the body is sent chunk by chunk, so
+# large batches never exist as one str plus one bytes copy
+PAYLOAD_CHUNK_PRIMITIVES = 512
+
+
+def _uses_proxy(url: str) -> bool:
+    """True when the environment (HTTP(S)_PROXY, NO_PROXY) routes url through a proxy."""
+    parts = urlsplit(url)
+    return (parts.scheme in urllib.request.getproxies()
+            and not urllib.request.proxy_bypass(parts.hostname or ""))
+
+
+def _to_dicts(primitives: List[Any]) -> List[Dict]:
+    """Convert primitives to dicts if needed (RiskPrimitive.to_dict avoids asdict's deepcopy)."""
+    # Already plain dicts: hand the caller's list through instead of copying it
+    if all(isinstance(p, dict) for p in primitives):
+        return primitives
+    return [
+        p.to_dict() if hasattr(p, 'to_dict')
+        else asdict(p) if hasattr(p, '__dataclass_fields__') else p
+        for p in primitives
+    ]
+
 @dataclass
 class WebhookConfig:
     url: str
     secret: Optional[str] = None
     headers: Optional[Dict[str, str]] = None
     tier: str = "operator"  # observer, operator, fund_api, sovereign
+    stream: bool = False  # observer tier only: send NDJSON lines instead of one envelope
 
 # ============================================================================
 # WEBHOOK DELIVERY
@@ -33,20 +76,31 @@ class WebhookDelivery:
     
     def __init__(self, config: WebhookConfig):
         self.config = config
+        self._conn = None  # keep-alive connection to config.url, opened on first send
+        self._target = None
+        self._lock = threading.Lock()
+        # Proxied endpoints go through urllib, which honours the proxy settings
+        self._via_proxy = _uses_proxy(config.url)
+        self._ndjson = config.stream and config.tier == "observer"
+        self._hmac_template = (
+            hmac.new(config.secret.encode(), digestmod="sha256") if config.secret else None
+        )
     
-    def _sign_payload(self, payload: bytes) -> str:
-        """Generate HMAC signature for payload."""
-        if not self.config.secret:
+    def _sign_payload(self, chunks: Sequence[bytes]) -> str:
+        """Generate HMAC signature over the payload body chunks."""
+        if self._hmac_template is None:
             return ""
-        return hmac.new(
-            self.config.secret.encode(),
-            payload,
-            hashlib.sha256
-        ).hexdigest()
+        # Copying the keyed state skips re-deriving the inner/outer pads
+        mac = self._hmac_template.copy()
+        for chunk in chunks:
+            mac.update(chunk)
+        return mac.hexdigest()
     
-    def _filter_by_tier(self, primitives: List[Dict]) -> List[Dict]:
+    def _filter_by_tier(self, primitives: List[Dict], now_iso: str = None) -> List[Dict]:
         """Filter primitives based on access tier."""
         tier = self.config.tier
+        if now_iso is None:
+            now_iso = datetime.now(timezone.utc).isoformat()
         
         if tier == "observer":
             # Aggregated heatmaps only - anonymize and delay
@@ -63,95 +117,172 @@ class WebhookDelivery:
         
         elif tier == "fund_api":
             # Full primitives + metadata
+            # 6-byte BLAKE2b digest: same 12 hex chars as before, cheaper than md5
+            canonical = _CANONICAL_ENCODER.encode
+            blake2b = hashlib.blake2b
             return [{
                 **p,
-                "delivery_timestamp": datetime.now(timezone.utc).isoformat(),
-                "stream_id": hashlib.md5(json.dumps(p, sort_keys=True).encode()).hexdigest()[:12]
+                "delivery_timestamp": now_iso,
+                "stream_id": blake2b(canonical(p).encode(), digest_size=6).hexdigest()
             } for p in primitives]
         
         elif tier == "sovereign":
             # Full + custom fields
             return [{
                 **p,
-                "delivery_timestamp": datetime.now(timezone.utc).isoformat(),
+                "delivery_timestamp": now_iso,
                 "exclusivity_marker": True,
                 "raw_signal_count": 0  # Would include actual count
             } for p in primitives]
         
         return primitives
     
-    def deliver(self, primitives: List[Any]) -> Dict[str, Any]:
-        """Send primitives to webhook endpoint."""
-        # Convert to dicts if needed
-        prim_dicts = [
-            asdict(p) if hasattr(p, '__dataclass_fields__') else p 
-            for p in primitives
-        ]
+    def build_payload(self, prim_dicts: List[Dict]) -> Tuple[List[bytes], int]:
+        """Filter primitives for this tier and serialize the payload body as byte chunks."""
+        # One clock read per batch, shared by generated_at and delivery timestamps
+        now_iso = datetime.now(timezone.utc).isoformat()
         
         # Filter by tier
-        filtered = self._filter_by_tier(prim_dicts)
+        filtered = self._filter_by_tier(prim_dicts, now_iso)
+        
+        # Build payload: the envelope around "primitives", then the array in
+        # slices; the joined chunks are the same bytes as encoding it whole
+        count = len(filtered)
+        encode = _PAYLOAD_ENCODER.encode
+        if self._ndjson:
+            # One heatmap cell per line, no envelope, so consumers parse as they read
+            return [
+                "".join([encode(p) + "\n" for p in filtered[start:start + PAYLOAD_CHUNK_PRIMITIVES]]).encode('utf-8')
+                for start in range(0, count, PAYLOAD_CHUNK_PRIMITIVES)
+            ], count
         
-        # Build payload
-        payload = {
+        envelope = encode({
             "source": "blacksnow",
             "version": "0.1.0",
             "tier": self.config.tier,
-            "generated_at": datetime.now(timezone.utc).isoformat(),
-            "primitives": filtered,
-            "count": len(filtered)
-        }
-        
-        payload_bytes = json.dumps(payload, default=str).encode('utf-8')
+            "generated_at": now_iso,
+        })
+        chunks = [(envelope[:-1] + ',"primitives":[').encode('utf-8')]
+        for start in range(0, count, PAYLOAD_CHUNK_PRIMITIVES):
+            batch = ",".join(map(encode, filtered[start:start + PAYLOAD_CHUNK_PRIMITIVES]))
+            chunks.append(((',' if start else '') + batch).encode('utf-8'))
+        chunks.append(b'],"count":%d}' % count)
         
-        # Build headers
+        return chunks, count
+    
+    def deliver(self, primitives: List[Any]) -> Dict[str, Any]:
+        """Send primitives to webhook endpoint."""
+        return self.send(*self.build_payload(_to_dicts(primitives)))
+    
+    def send(self, chunks: Sequence[bytes], count: int) -> Dict[str, Any]:
+        """POST an already-serialized payload (body chunks) carrying count primitives."""
+        # Build headers; an explicit length keeps the chunked body a plain
+        # Content-Length request on the wire
         headers = {
-            "Content-Type": "application/json",
+            "Content-Type": "application/x-ndjson" if self._ndjson else "application/json",
             "User-Agent": "BlackSnow/0.1.0",
             "X-BlackSnow-Tier": self.config.tier,
+            # Constant across this delivery's retries so receivers can drop repeats
+            "X-BlackSnow-Delivery-Id": uuid.uuid4().hex,
+            "Content-Length": str(sum(map(len, chunks))),
         }
         
         if self.config.secret:
-            headers["X-BlackSnow-Signature"] = self._sign_payload(payload_bytes)
+            headers["X-BlackSnow-Signature"] = self._sign_payload(chunks)
         
         if self.config.headers:
             headers.update(self.config.headers)
         
-        # Send request
-        try:
-            req = urllib.request.Request(
-                self.config.url,
-                data=payload_bytes,
-                headers=headers,
-                method="POST"
-            )
-            
-            with urllib.request.urlopen(req, timeout=30) as response:
+        # Send request, reusing this endpoint's keep-alive connection
+        status = reason = None
+        for attempt in range(DELIVERY_RETRIES + 1):
+            try:
+                status, reason = self._post(chunks, headers)
+            except Exception as e:
                 return {
-                    "success": True,
-                    "status_code": response.status,
-                    "primitives_sent": len(filtered),
-                    "tier": self.config.tier,
+                    "success": False,
+                    "error": str(e),
                     "url": self.config.url
                 }
-                
-        except urllib.error.HTTPError as e:
+            if status not in RETRY_STATUSES or attempt == DELIVERY_RETRIES:
+                break
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+        
+        if status >= 300:
             return {
                 "success": False,
-                "error": f"HTTP {e.code}: {e.reason}",
+                "error": f"HTTP {status}: {reason}",
                 "url": self.config.url
             }
+        return {
+            "success": True,
+            "status_code": status,
+            "primitives_sent": count,
+            "tier": self.config.tier,
+            "url": self.config.url
+        }
+    
+    def _post(self, body: Sequence[bytes], headers: Dict[str, str]) -> Tuple[int, str]:
+        """POST body to the endpoint; returns (status, reason)."""
+        with self._lock:
+            if self._via_proxy:
+                return self._request_urllib(body, headers)
+            # A 3xx comes back as-is and send() reports it; the body is never re-posted
+            return self._post_keepalive(body, headers)
+    
+    def _post_keepalive(self, body: Sequence[bytes], headers: Dict[str, str]) -> Tuple[int, str]:
+        """POST body over the pooled connection (caller holds the lock)."""
+        reused = self._conn is not None
+        try:
+            return self._request(body, headers)
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            self.close()
+            if not reused:
+                raise
+        except Exception:
+            self.close()
+            raise
+        # The server dropped an idle keep-alive connection; retry once on a fresh one.
+        # It may have processed the first attempt, so receivers dedupe on the
+        # X-BlackSnow-Delivery-Id header, which is the same for both sends
+        try:
+            return self._request(body, headers)
+        except Exception:
+            self.close()
+            raise
+    
+    def _request(self, body: Sequence[bytes], headers: Dict[str, str]) -> Tuple[int, str]:
+        """Issue one POST, opening the connection on first use."""
+        if self._conn is None:
+            parts = urlsplit(self.config.url)
+            conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            self._conn = conn_cls(parts.hostname, parts.port, timeout=DELIVERY_TIMEOUT)
+            self._target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        
+        self._conn.request("POST", self._target, body=body, headers=headers)
+        response = self._conn.getresponse()
+        response.read()  # drain so the connection can carry the next request
+        if response.will_close:
+            self.close()
+        return response.status, response.reason
+    
+    def _request_urllib(self, body: Sequence[bytes], headers: Dict[str, str]) -> Tuple[int, str]:
+        """Issue one POST with urlopen (used for proxied endpoints)."""
+        req = urllib.request.Request(self.config.url, data=body, headers=headers, method="POST")
+        try:
+            with urllib.request.urlopen(req, timeout=DELIVERY_TIMEOUT) as response:
+                response.read()
+                return response.status, response.reason
+        except urllib.error.HTTPError as e:
+            return e.code, e.reason
         except urllib.error.URLError as e:
-            return {
-                "success": False,
-                "error": str(e.reason),
-                "url": self.config.url
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "url": self.config.url
-            }
+            raise ConnectionError(str(e.reason)) from e
+    
+    def close(self):
+        """Drop the pooled connection to the endpoint."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
 
 # ============================================================================
@@ -163,19 +294,34 @@ class WebhookManager:
     
     def __init__(self):
         self.endpoints: List[WebhookConfig] = []
+        # One delivery (and so one keep-alive connection) per endpoint, reused across calls
+        self._deliveries: Dict[int, WebhookDelivery] = {}
     
-    def add_endpoint(self, url: str, tier: str = "operator", secret: str = None):
+    def add_endpoint(self, url: str, tier: str = "operator", secret: str = None, stream: bool = False):
         """Register a webhook endpoint."""
-        self.endpoints.append(WebhookConfig(url=url, tier=tier, secret=secret))
+        self.endpoints.append(WebhookConfig(url=url, tier=tier, secret=secret, stream=stream))
     
     def deliver_all(self, primitives: List[Any]) -> List[Dict]:
-        """Deliver to all registered endpoints."""
-        results = []
+        """Deliver to all registered endpoints concurrently, results in endpoint order."""
+        if not self.endpoints:
+            return []
+        
+        # Payloads depend only on the tier and body format, so serialize once per pair
+        prim_dicts = _to_dicts(primitives)
+        payloads = {}
+        jobs = []
         for config in self.endpoints:
-            delivery = WebhookDelivery(config)
-            result = delivery.deliver(primitives)
-            results.append(result)
-        return results
+            delivery = self._deliveries.get(id(config))
+            if delivery is None or delivery.config is not config:
+                delivery = self._deliveries[id(config)] = WebhookDelivery(config)
+            key = (config.tier, delivery._ndjson)
+            if key not in payloads:
+                payloads[key] = delivery.build_payload(prim_dicts)
+            jobs.append((delivery, payloads[key]))
+        
+        # Each send blocks on its own endpoint; overlap them
+        with ThreadPoolExecutor(max_workers=min(MAX_DELIVERY_WORKERS, len(jobs))) as pool:
+            return list(pool.map(lambda job: job[0].send(*job[1]), jobs))
     
     def load_from_config(self, config_path: str):
         """Load endpoints from config file."""
@@ -187,7 +333,8 @@ class WebhookManager:
                 self.add_endpoint(
                     url=ep["url"],
                     tier=ep.get("tier", "operator"),
-                    secret=ep.get("secret")
+                    secret=ep.get("secret"),
+                    stream=ep.get("stream", False)
                 )
 
 
@@ -1,7 +1,9 @@
 import sys
-import subprocess
 import os
 
+# tv_control lives alongside this script
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
 def handle_command(text):
     # Command format: tv.action params
     # Example: tv.yt Karan Aujla
@@ -29,9 +31,14 @@ def handle_command(text):
         # In a real implementation, we'd save this IP to a state file
         return f"Targeting TV at {ip}..."
     
-    script_path = os.path.join(os.path.dirname(__file__), "tv_control.py")
-    result = subprocess.run(["python3", script_path, ip, action] + params, capture_output=True, text=True)
-    return result.stdout.strip()
+    # In-process call: no interpreter spawn per keypress, and the ADB device
+    # handle cached by tv_control is reused across commands
+    try:
+        # Imported here so a host without ppadb gets an error string, not a traceback
+        from tv_control import control_tv
+        return control_tv(ip, action, " ".join(params) if params else None)
+    except Exception as e:
+        return f"Error: {e}"
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
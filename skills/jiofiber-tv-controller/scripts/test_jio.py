@@ -0,0 +1,97 @@
+import sys
+import os
+import types
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+class FakeDevice:
+    def __init__(self, error=None):
+        self.error = error
+        self.commands = []
+
+    def shell(self, command):
+        self.commands.append(command)
+        if self.error is not None:
+            raise self.error
+
+class FakeClient:
+    devices = []  # handed out in order by device()
+
+    def __init__(self, host, port):
+        pass
+
+    def remote_connect(self, host, port):
+        pass
+
+    def device(self, serial):
+        return FakeClient.devices.pop(0)
+
+def run_retry_tests():
+    # Stand-in ppadb so the reconnect logic runs without an adb server
+    client_module = types.ModuleType("ppadb.client")
+    client_module.Client = FakeClient
+    saved = {name: sys.modules.pop(name, None) for name in ("ppadb", "ppadb.client", "tv_control")}
+    sys.modules["ppadb"] = types.ModuleType("ppadb")
+    sys.modules["ppadb.client"] = client_module
+    try:
+        import tv_control
+
+        # Stale cached handle: the transport refused the command, so it is resent once
+        stale, fresh = FakeDevice(ConnectionResetError("closed")), FakeDevice()
+        FakeClient.devices = [stale, fresh]
+        tv_control.get_device("10.0.0.5")
+        assert tv_control.control_tv("10.0.0.5", "power") == "Toggled Power"
+        assert len(stale.commands) == 1 and len(fresh.commands) == 1
+        print("Stale handle -> reconnected, power sent once per handle")
+
+        # A timeout may come after the keyevent landed; power must not toggle twice
+        slow = FakeDevice(TimeoutError("read timed out"))
+        tv_control._devices["10.0.0.6"] = slow
+        FakeClient.devices = [FakeDevice()]
+        try:
+            tv_control.control_tv("10.0.0.6", "power")
+            raise AssertionError("timeout was swallowed")
+        except TimeoutError:
+            pass
+        assert len(slow.commands) == 1 and len(FakeClient.devices) == 1
+        print("Timeout -> not retried")
+
+        # A handle created for this call is not retried either
+        new = FakeDevice(ConnectionResetError("closed"))
+        FakeClient.devices = [new, FakeDevice()]
+        try:
+            tv_control.control_tv("10.0.0.7", "up")
+            raise AssertionError("error on a fresh handle was swallowed")
+        except ConnectionResetError:
+            pass
+        assert len(new.commands) == 1 and len(FakeClient.devices) == 1
+        print("Fresh handle -> not retried")
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+def run_tests():
+    run_retry_tests()
+    # Simulate a host without ppadb: a None entry makes the import raise ImportError
+    saved = {name: sys.modules.pop(name, None) for name in ("ppadb", "ppadb.client", "tv_control")}
+    sys.modules["ppadb"] = None
+    sys.modules["ppadb.client"] = None
+    try:
+        from jio_controller import handle_command
+        result = handle_command("tv.up")
+        print(f"Missing ppadb -> {result}")
+        assert result.startswith("Error: "), result
+        assert handle_command("hello") == "Not a TV command."
+        assert handle_command("tv.connect 10.0.0.5") == "Targeting TV at 10.0.0.5..."
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+    print("All jio_controller tests passed.")
+
+if __name__ == "__main__":
+    run_tests()
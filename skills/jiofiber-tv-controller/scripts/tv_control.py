@@ -16,47 +16,75 @@ KEY_VOLUP = 24
 KEY_VOLDOWN = 25
 KEY_MUTE = 164
 
+# When imported (jio_controller), keep one ADB client and one device handle
+# per TV so repeated keypresses skip the remote_connect round trip
+_client = None
+_devices = {}
+
 def get_device(ip):
-    client = AdbClient(host="127.0.0.1", port=5037)
+    global _client
+    device = _devices.get(ip)
+    if device is not None:
+        return device
+    if _client is None:
+        _client = AdbClient(host="127.0.0.1", port=5037)
     # Note: ppadb expects an adb server to be running.
     # If no adb server is running, this will fail.
     # However, OpenClaw nodes often have adb server available.
     try:
-        client.remote_connect(ip, 5555)
-        device = client.device(f"{ip}:5555")
+        _client.remote_connect(ip, 5555)
+        device = _client.device(f"{ip}:5555")
+        if device is not None:
+            _devices[ip] = device
         return device
     except Exception as e:
         print(f"Connection failed: {e}")
         return None
 
+def _shell(ip, device, cached, command):
+    try:
+        device.shell(command)
+    except (ConnectionError, RuntimeError):
+        # A cached handle went stale (TV rebooted, adb server restarted): the adb
+        # transport refused it, so the command never ran; reconnect once. Timeouts
+        # and read errors may follow a delivered keyevent and are not retried.
+        if not cached:
+            raise
+        _devices.pop(ip, None)
+        device = get_device(ip)
+        if device is None:
+            raise
+        device.shell(command)
+
 def control_tv(ip, action, params=None):
+    cached = ip in _devices
     device = get_device(ip)
     if not device:
         return f"Error: Could not connect to {ip}"
     
     if action == "power":
-        device.shell(f"input keyevent {KEY_POWER}")
+        _shell(ip, device, cached, f"input keyevent {KEY_POWER}")
         return "Toggled Power"
     elif action == "play":
-        device.shell(f"input keyevent {KEY_PLAY_PAUSE}")
+        _shell(ip, device, cached, f"input keyevent {KEY_PLAY_PAUSE}")
         return "Toggled Play/Pause"
     elif action in ["up", "down", "left", "right", "enter", "back", "home"]:
         key = {
             "up": KEY_UP, "down": KEY_DOWN, "left": KEY_LEFT, 
             "right": KEY_RIGHT, "enter": KEY_ENTER, "back": KEY_BACK, "home": KEY_HOME
         }[action]
-        device.shell(f"input keyevent {key}")
+        _shell(ip, device, cached, f"input keyevent {key}")
         return f"Sent {action}"
     elif action == "yt":
         # Launch YouTube search or specific video
         query = params if params else ""
         # Generic YT Search Intent
-        device.shell(f"am start -a android.intent.action.VIEW \"https://www.youtube.com/results?search_query={query}\"")
+        _shell(ip, device, cached, f"am start -a android.intent.action.VIEW \"https://www.youtube.com/results?search_query={query}\"")
         return f"Searching YouTube for: {query}"
     elif action == "vol":
         level = params.lower() if params else "up"
         key = KEY_VOLUP if level == "up" else KEY_VOLDOWN if level == "down" else KEY_MUTE
-        device.shell(f"input keyevent {key}")
+        _shell(ip, device, cached, f"input keyevent {key}")
         return f"Volume {level}"
     else:
         return f"Unknown action: {action}"
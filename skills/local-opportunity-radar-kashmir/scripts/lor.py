@@ -1,11 +1,22 @@
 import yaml
 import os
 import json
+import re
 from datetime import datetime
 
+_NON_DIGIT_RE = re.compile(r'[^\d]')
+
+# libyaml-backed loader when PyYAML was built with it; same safe semantics
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_EDU_RANK = {"10th": 1, "12th": 2, "Graduate": 3, "Post-Graduate": 4}
+
 class LOR_Engine:
     def __init__(self, user_profile_path):
         self.profile = self._load_profile(user_profile_path)
+        # Lowercased skill set, built once per engine instead of once per
+        # required skill of every opportunity
+        self._skills_lower = frozenset(s.lower() for s in self.profile.get("skills", []))
         
     def _load_profile(self, path):
         # Mock profile if not exists
@@ -24,7 +35,7 @@ class LOR_Engine:
             return default_profile
         
         with open(path, 'r') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_YAML_LOADER)
 
     def calculate_eligibility(self, opportunity):
         score = 1.0
@@ -43,15 +54,15 @@ class LOR_Engine:
             return None # Hard filter
 
         # Check Education (Simplified)
-        edu_rank = {"10th": 1, "12th": 2, "Graduate": 3, "Post-Graduate": 4}
         req_edu = opportunity.get("min_education", "10th")
-        if edu_rank.get(self.profile["education"], 0) < edu_rank.get(req_edu, 0):
+        if _EDU_RANK.get(self.profile["education"], 0) < _EDU_RANK.get(req_edu, 0):
             return None # Hard filter
 
         # Penalty for lack of specific skills if mentioned
         req_skills = opportunity.get("required_skills", [])
         if req_skills:
-            match_count = sum(1 for s in req_skills if s.lower() in [p.lower() for p in self.profile.get("skills", [])])
+            user_skills = self._skills_lower
+            match_count = sum(1 for s in req_skills if s.lower() in user_skills)
             skill_score = match_count / len(req_skills)
             score *= (0.5 + 0.5 * skill_score)
 
@@ -79,17 +90,14 @@ class LOR_Engine:
         }
 
     def generate_daily_report(self, opportunities, title_suffix=""):
-        eligible_list = []
-        for opp in opportunities:
-            res = self.calculate_eligibility(opp)
-            if res:
-                eligible_list.append(res)
+        score = self.calculate_eligibility
+        eligible_list = [res for opp in opportunities if (res := score(opp))]
         
         # Sort by Pay or Deadline
         # Since Pay is a string "₹12,000", we need to extract the number for sorting
         def get_pay_val(x):
             try:
-                return int(re.sub(r'[^\d]', '', x['pay']))
+                return int(_NON_DIGIT_RE.sub('', x['pay']))
             except:
                 return 0
 
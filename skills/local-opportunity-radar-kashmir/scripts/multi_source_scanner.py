@@ -3,7 +3,16 @@ import xml.etree.ElementTree as ET
 import re
 import json
 import os
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+
+# ASCII bytes that are not [a-zA-Z0-9]; deleting them after an ascii/ignore
+# encode keeps exactly what re.sub(r'[^a-zA-Z0-9]', '', ...) kept
+_NON_ALNUM = bytes(c for c in range(128) if not chr(c).isalnum())
+
+_VACANCY_RE = re.compile(r'(\d+)\s*(?:Posts?|Vacancies|Vacancies)', re.I)
 
 class MultiSourceScanner:
     """
@@ -25,35 +34,48 @@ class MultiSourceScanner:
         "JKSSB Pharmacist"
     ]
     
+    # (lowercased key, display name), in match-priority order
+    DISTRICTS = tuple((d.lower(), d) for d in (
+        "Srinagar", "Kupwara", "Baramulla", "Anantnag", "Budgam", "Pulwama",
+        "Shopian", "Kulgam", "Ganderbal", "Bandipora", "Jammu", "Udhampur"
+    ))
+    
+    # All queries hit news.google.com; fetched side by side over one session
+    MAX_FETCH_WORKERS = 8
+    
     def __init__(self, max_age_days=60):
         self.max_age_days = max_age_days
         self.cutoff_date = datetime.now() - timedelta(days=max_age_days)
+        self.cutoff_ts = self.cutoff_date.timestamp()
+        # Pooled keep-alive connections (requests already negotiates gzip)
+        self.session = requests.Session()
         
     def fetch_google_news_rss(self, query):
         url = f"{self.GOOGLE_NEWS_BASE}{requests.utils.quote(query)}"
         try:
-            resp = requests.get(url, timeout=15)
+            resp = self.session.get(url, timeout=15)
             if resp.status_code != 200:
                 return []
             
-            # Parse XML
-            root = ET.fromstring(resp.text)
+            # Stream-parse the raw bytes (the parser honours the declared
+            # encoding) and release each <item> once its fields are read
             items = []
             
-            for item in root.findall('.//item'):
+            for _, item in ET.iterparse(BytesIO(resp.content)):
+                if item.tag != 'item':
+                    continue
                 title = item.find('title')
                 pub_date = item.find('pubDate')
                 source = item.find('source')
                 
-                if title is None:
-                    continue
-                    
-                items.append({
-                    "title": title.text,
-                    "pub_date": pub_date.text if pub_date is not None else None,
-                    "source": source.text if source is not None else "Google News",
-                    "query": query
-                })
+                if title is not None:
+                    items.append({
+                        "title": title.text,
+                        "pub_date": pub_date.text if pub_date is not None else None,
+                        "source": source.text if source is not None else "Google News",
+                        "query": query
+                    })
+                item.clear()
             return items
         except Exception as e:
             print(f"Error fetching {query}: {e}")
@@ -61,18 +83,19 @@ class MultiSourceScanner:
     
     def scan_all_queries(self):
         all_items = []
-        for query in self.QUERIES:
-            items = self.fetch_google_news_rss(query)
-            all_items.extend(items)
-            print(f"Fetched {len(items)} items for: {query}")
+        with ThreadPoolExecutor(max_workers=min(self.MAX_FETCH_WORKERS, len(self.QUERIES))) as pool:
+            # map() yields in query order, so output matches the sequential scan
+            for query, items in zip(self.QUERIES, pool.map(self.fetch_google_news_rss, self.QUERIES)):
+                all_items.extend(items)
+                print(f"Fetched {len(items)} items for: {query}")
         return all_items
     
     def deduplicate(self, items):
-        seen_titles = set()
+        seen_titles = set()  # 64-bit fingerprints of normalized titles
         unique = []
         for item in items:
-            # Normalize title for comparison
-            norm_title = re.sub(r'[^a-zA-Z0-9]', '', item['title'].lower())[:50]
+            # Normalize title for comparison (bytes.translate deletes in C, no regex pass)
+            norm_title = hash(item['title'].lower().encode('ascii', 'ignore').translate(None, _NON_ALNUM)[:50])
             if norm_title not in seen_titles:
                 seen_titles.add(norm_title)
                 unique.append(item)
@@ -81,12 +104,13 @@ class MultiSourceScanner:
     def filter_by_date(self, items):
         # Filter items within max_age_days
         filtered = []
+        cutoff_ts = self.cutoff_ts
         for item in items:
             if item.get('pub_date'):
                 try:
-                    # Parse RFC 2822 date
-                    pub = datetime.strptime(item['pub_date'], "%a, %d %b %Y %H:%M:%S %Z")
-                    if pub >= self.cutoff_date:
+                    # Parse RFC 2822 date (honours the zone, e.g. GMT or +0530)
+                    pub = parsedate_to_datetime(item['pub_date'])
+                    if pub.timestamp() >= cutoff_ts:
                         filtered.append(item)
                 except:
                     # If date parsing fails, include anyway
@@ -103,18 +127,15 @@ class MultiSourceScanner:
             title = item['title']
             
             # Extract vacancy count
-            vacancy_match = re.search(r'(\d+)\s*(?:Posts?|Vacancies|Vacancies)', title, re.I)
+            vacancy_match = _VACANCY_RE.search(title)
             vacancies = int(vacancy_match.group(1)) if vacancy_match else None
             
             # Extract department/role
             role = title.split(' - ')[0] if ' - ' in title else title.split(':')[0]
             
-            # Determine district (default All for govt jobs)
-            district = "All"
-            for d in ["Srinagar", "Kupwara", "Baramulla", "Anantnag", "Budgam", "Pulwama", "Shopian", "Kulgam", "Ganderbal", "Bandipora", "Jammu", "Udhampur"]:
-                if d.lower() in title.lower():
-                    district = d
-                    break
+            # Determine district (default All for govt jobs); first listed match wins
+            title_lower = title.lower()
+            district = next((d for key, d in self.DISTRICTS if key in title_lower), "All")
             
             opportunities.append({
                 "title": role.strip(),
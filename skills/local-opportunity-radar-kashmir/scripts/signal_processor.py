@@ -2,6 +2,19 @@ import json
 import os
 import re
 
+# Extraction patterns, compiled once at import rather than looked up per signal
+_TITLE_RES = tuple(re.compile(p, re.I) for p in (
+    r"(?:Post of|Recruitment for|Hiring|Vacancy for|engagement of|engagement for|advertisement for)\s+([^.\n,]+)",
+    r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Posts|Vacancies|Jobs|Recruitment))",
+    r"(?:ADVERTISEMENT NOTICE)\s*:?\s*([^.\n]+)"
+))
+_PAY_RE = re.compile(r"(?:Pay|Salary|Stipend|₹|Rs\.?)\s*:?\s*([\d,]+(?:/month|/-)?)", re.I)
+_LOC_RES = tuple(re.compile(p, re.I) for p in (
+    r"(Kupwara|Handwara|Srinagar|Baramulla|Anantnag|Budgam|Ganderbal|Bandipora|Pulwama|Shopian|Kulgam)",
+    r"District\s+([^.\n,]+)"
+))
+_QUAL_RE = re.compile(r"(?:Qual|Education|Eligibility|Qualification)\s*:?\s*([^.\n]+)", re.I)
+
 class SignalProcessor:
     def __init__(self, model_hook=None):
         self.model_hook = model_hook
@@ -25,37 +38,28 @@ class SignalProcessor:
         }
         
         # Improved Title Extraction
-        title_patterns = [
-            r"(?:Post of|Recruitment for|Hiring|Vacancy for|engagement of|engagement for|advertisement for)\s+([^.\n,]+)",
-            r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Posts|Vacancies|Jobs|Recruitment))",
-            r"(?:ADVERTISEMENT NOTICE)\s*:?\s*([^.\n]+)"
-        ]
-        for pattern in title_patterns:
-            match = re.search(pattern, text, re.I)
+        for rx in _TITLE_RES:
+            match = rx.search(text)
             if match:
                 opportunity["title"] = match.group(1).strip()
                 break
             
         # Pay Extraction
-        pay_match = re.search(r"(?:Pay|Salary|Stipend|₹|Rs\.?)\s*:?\s*([\d,]+(?:/month|/-)?)", text, re.I)
+        pay_match = _PAY_RE.search(text)
         if pay_match:
             val = pay_match.group(1).strip()
             opportunity["pay"] = f"₹{val}" if '₹' not in val and 'Rs' not in val else val
             
         # District/Location Extraction
-        loc_patterns = [
-            r"(Kupwara|Handwara|Srinagar|Baramulla|Anantnag|Budgam|Ganderbal|Bandipora|Pulwama|Shopian|Kulgam)",
-            r"District\s+([^.\n,]+)"
-        ]
-        for pattern in loc_patterns:
-            match = re.search(pattern, text, re.I)
+        for rx in _LOC_RES:
+            match = rx.search(text)
             if match:
                 opportunity["district"] = match.group(1).strip().capitalize()
                 opportunity["location"] = match.group(1).strip().capitalize()
                 break
 
         # Qualification
-        qual_match = re.search(r"(?:Qual|Education|Eligibility|Qualification)\s*:?\s*([^.\n]+)", text, re.I)
+        qual_match = _QUAL_RE.search(text)
         if qual_match:
              q = qual_match.group(1).lower()
              if "grad" in q or "degree" in q:
@@ -1,13 +1,44 @@
 import requests
-from bs4 import BeautifulSoup
-import re
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+import hashlib
 import json
 import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
+# BeautifulSoup backend: lxml's C parser when installed, else the stdlib one
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
+# Only post containers (and what is inside them) are built into the tree;
+# the page chrome around them is discarded as it is parsed
+_MESSAGE_STRAINER = SoupStrainer('div', attrs={'class': 'tgme_widget_message'})
+
+# Shared by all PDF downloads so files from the same host (e.g. jkgad.nic.in)
+# reuse keep-alive connections instead of a fresh TLS handshake each
+_PDF_SESSION = requests.Session()
+_PDF_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                           max_retries=Retry(total=3, backoff_factor=0.3))
+_PDF_SESSION.mount("https://", _PDF_ADAPTER)
+_PDF_SESSION.mount("http://", _PDF_ADAPTER)
+
+# Substrings that mark a Telegram post as a likely opportunity
+OPPORTUNITY_KEYWORDS = ("recruitment", "job", "notice", "tender", "post", "vacancy", "hiring")
+
 class TelegramScraper:
+    # Channel pages are fetched side by side over one session
+    MAX_FETCH_WORKERS = 8
+    
     def __init__(self, channels):
         self.channels = channels
+        # Pooled keep-alive connections to t.me, shared by the fetch workers
+        self.session = requests.Session()
 
     def fetch_latest_messages(self, channel_id):
         url = f"https://t.me/s/{channel_id}"
@@ -15,24 +46,25 @@ class TelegramScraper:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
         try:
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self.session.get(url, headers=headers, timeout=15)
             if response.status_code != 200:
                 print(f"Error: {channel_id} returned status {response.status_code}")
                 return []
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, _HTML_PARSER, parse_only=_MESSAGE_STRAINER)
             print(f"DEBUG: Response length for {channel_id}: {len(response.text)}")
             if "Robot Check" in response.text or "Captcha" in response.text:
                 print(f"DEBUG: Blocked by bot check on {channel_id}")
             
             messages = []
             
-            # Broader search for message-like containers
-            msg_elements = soup.find_all('div', class_=re.compile(r'tgme_widget_message'))
+            # One container per post (the old class-substring regex also matched
+            # the _wrap/_bubble divs around it, yielding each post several times)
+            msg_elements = soup.select('div.tgme_widget_message')
             print(f"DEBUG: Found {len(msg_elements)} message elements in @{channel_id}")
             
             for el in msg_elements:
-                text_el = el.find('div', class_='tgme_widget_message_text')
+                text_el = el.select_one('div.tgme_widget_message_text')
                 if not text_el:
                     continue
                     
@@ -53,8 +85,12 @@ class TelegramScraper:
 
     def scan_all(self):
         all_signals = []
-        for channel in self.channels:
-            all_signals.extend(self.fetch_latest_messages(channel))
+        if not self.channels:
+            return all_signals
+        with ThreadPoolExecutor(max_workers=min(self.MAX_FETCH_WORKERS, len(self.channels))) as pool:
+            # map() yields in channel order, so output matches the sequential scan
+            for messages in pool.map(self.fetch_latest_messages, self.channels):
+                all_signals.extend(messages)
         return all_signals
 
 class PDFProcessor:
@@ -62,32 +98,61 @@ class PDFProcessor:
     def extract_text(pdf_path):
         try:
             import fitz # PyMuPDF
-            doc = fitz.open(pdf_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            return text
+            with fitz.open(pdf_path) as doc:
+                return "".join(page.get_text() for page in doc)
         except Exception as e:
             return f"PDF Error: {e}"
 
     @staticmethod
-    def download_pdf(url, dest_dir="/tmp/lor_pdfs"):
+    def extract_many(paths, workers=None):
+        # Text decoding is CPU-bound; one process per core (workers=None) sidesteps the GIL
+        paths = list(paths)
+        if not paths:
+            return []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(PDFProcessor.extract_text, paths))
+
+    @staticmethod
+    def pdf_filename(url):
+        name = url.split('/')[-1]
+        return name if name.endswith('.pdf') else name + ".pdf"
+
+    @staticmethod
+    def download_pdf(url, dest_dir="/tmp/lor_pdfs", filename=None):
         os.makedirs(dest_dir, exist_ok=True)
-        local_filename = os.path.join(dest_dir, url.split('/')[-1])
-        if not local_filename.endswith('.pdf'):
-            local_filename += ".pdf"
+        local_filename = os.path.join(dest_dir, filename or PDFProcessor.pdf_filename(url))
             
         try:
-            with requests.get(url, stream=True, timeout=30) as r:
+            with _PDF_SESSION.get(url, stream=True, timeout=30) as r:
                 r.raise_for_status()
                 with open(local_filename, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
+                    for chunk in r.iter_content(chunk_size=65536):
                         f.write(chunk)
             return local_filename
         except Exception as e:
             print(f"Download failed {url}: {e}")
             return None
 
+    @staticmethod
+    def download_many(urls, dest_dir="/tmp/lor_pdfs", concurrency=8):
+        # Overlap the downloads on the shared session; paths (None on failure) in url order
+        urls = list(urls)
+        if not urls:
+            return []
+        # Each distinct url is fetched once; urls sharing a basename get a short
+        # url hash appended so no two concurrent downloads write the same file
+        unique = list(dict.fromkeys(urls))
+        names = {url: PDFProcessor.pdf_filename(url) for url in unique}
+        counts = Counter(names.values())
+        for url, name in names.items():
+            if counts[name] > 1:
+                digest = hashlib.blake2b(url.encode(), digest_size=4).hexdigest()
+                names[url] = f"{name[:-4]}-{digest}.pdf"
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(unique))) as pool:
+            paths = dict(zip(unique, pool.map(
+                lambda url: PDFProcessor.download_pdf(url, dest_dir, names[url]), unique)))
+        return [paths[url] for url in urls]
+
 def main():
     # Example Scan
     CHANNELS = ["JKUpdates"]
@@ -95,11 +160,12 @@ def main():
     signals = scraper.scan_all()
     
     # Filter for signals that look like opportunities (keyword check)
-    keywords = ["recruitment", "job", "notice", "tender", "post", "vacancy", "hiring"]
     opportunities = []
     
     for s in signals:
-        if any(k in s['text'].lower() for k in keywords):
+        # Lowercase once per signal, not once per keyword probe
+        text = s['text'].lower()
+        if any(k in text for k in OPPORTUNITY_KEYWORDS):
             opportunities.append(s)
             
     print(f"Found {len(opportunities)} potential signals in Telegram.")
@@ -1,57 +1,78 @@
 #!/usr/bin/env python3
 import sys
 import os
+import io
 import json
 import re
 import subprocess
+from contextlib import redirect_stdout
+from functools import lru_cache
 from pathlib import Path
+from shutil import which
+
+# Characters not allowed in download filenames built from the query
+_SANITIZE = re.compile(r'[^a-zA-Z0-9_]')
 
 def log_output(message):
     print(f"[Media Orchestrator] {message}", file=sys.stderr)
 
+@lru_cache(maxsize=1)
+def _has_ffmpeg():
+    # PATH lookup in-process, once per process
+    return which("ffmpeg") is not None
+
 def main(request_type: str, query: str, output_format: str = None, resolution: str = None, chat_target: str = None, media_type: str = None):
     workspace = Path("/home/ky11rie/.openclaw/workspace")
+    # WhatsApp targets are phone numbers; anything else (or no target) is Telegram
+    is_whatsapp = bool(chat_target) and chat_target.startswith("+")
 
     # Check for ffmpeg
-    has_ffmpeg = subprocess.run(["which", "ffmpeg"], capture_output=True).returncode == 0
+    has_ffmpeg = _has_ffmpeg()
     if not has_ffmpeg:
         log_output("ffmpeg/ffprobe not found. Using fallback formats (m4a/mp4 direct).")
 
     # Handle Spotify requests
     if "spotify" in request_type.lower() or "spotify" in query.lower():
         log_output("Delegating to Spotify Surface skill...")
-        # Use spotify_surface.py directly
-        spotify_script_path = workspace / "skills" / "spotify-surface" / "scripts" / "spotify_surface.py"
+        # Call the Spotify Surface skill in-process rather than spawning its script
+        spotify_scripts = str(workspace / "skills" / "spotify-surface" / "scripts")
+        if spotify_scripts not in sys.path:
+            sys.path.insert(0, spotify_scripts)
         try:
+            from spotify_surface import SpotifySurface
             # Determine source based on chat_target (WhatsApp or Telegram)
-            source = "whatsapp" if chat_target and chat_target.startswith("+") else "telegram"
-            cmd = ["python3", str(spotify_script_path), source, query]
-            spotify_result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            log_output(f"Spotify Surface output: {spotify_result.stdout}")
-            # spotify_surface script already handles output emission
-            return
-        except subprocess.CalledProcessError as e:
-            log_output(f"Spotify Surface failed: {e.stderr}")
-            message_user(chat_target, "Could not fulfill Spotify request.", chat_target.startswith("+"))
+            source = "whatsapp" if is_whatsapp else "telegram"
+            # Its JSON outputs go to our log, as when it ran as a captured subprocess
+            buf = io.StringIO()
+            with redirect_stdout(buf):
+                surface = SpotifySurface(str(workspace))
+                track = surface.search_track(query)
+                if track:
+                    surface.emit_outputs(surface.persist_metadata(track, source))
+                else:
+                    print(json.dumps({"outputs": [{"type": "chat.message", "text": f"No Spotify match found for: {query}"}]}))
+            log_output(f"Spotify Surface output: {buf.getvalue()}")
+            # spotify_surface already handles output emission
             return
         except Exception as e:
-            log_output(f"Unexpected Spotify Surface error: {e}")
-            message_user(chat_target, "An unexpected error occurred with Spotify.", chat_target.startswith("+"))
+            log_output(f"Spotify Surface failed: {e}")
+            message_user(chat_target, "Could not fulfill Spotify request.", is_whatsapp)
             return
 
     # Handle direct audio/video downloads via yt-dlp
     download_filename = ""
     yt_dlp_format_string = ""
+    safe_query = _SANITIZE.sub('_', query)
     if media_type == "audio" or output_format == "mp3":
         if has_ffmpeg:
-            download_filename = f"{re.sub(r'[^a-zA-Z0-9_]', '_', query)}_Audio.mp3"
+            download_filename = f"{safe_query}_Audio.mp3"
             yt_dlp_format_string = "-x --audio-format mp3"
         else:
             # Fallback to high quality m4a audio stream
-            download_filename = f"{re.sub(r'[^a-zA-Z0-9_]', '_', query)}_Audio.m4a"
+            download_filename = f"{safe_query}_Audio.m4a"
             yt_dlp_format_string = "-f 140"
     elif media_type == "video" and output_format == "mp4":
-        download_filename = f"{re.sub(r'[^a-zA-Z0-9_]', '_', query)}_Video.mp4"
+        download_filename = f"{safe_query}_Video.mp4"
         if has_ffmpeg:
             if resolution:
                 # Example: 480p -> bestvideo[height<=480][ext=mp4]
@@ -62,7 +83,7 @@ def main(request_type: str, query: str, output_format: str = None, resolution: s
             # Fallback to combined mp4 format (usually 360p or 720p) to avoid merging requirement
             yt_dlp_format_string = "-f 18/22"
     else:
-        message_user(chat_target, f"Unsupported media type or format requested: {media_type} {output_format}", chat_target.startswith("+"))
+        message_user(chat_target, f"Unsupported media type or format requested: {media_type} {output_format}", is_whatsapp)
         return
 
     download_path = workspace / download_filename
@@ -78,19 +99,22 @@ def main(request_type: str, query: str, output_format: str = None, resolution: s
     try:
         subprocess.run(yt_dlp_command, check=True)
         if download_path.exists():
-            message_user(chat_target, None, is_whatsapp=chat_target.startswith("+"), file_path=str(download_path))
+            message_user(chat_target, None, is_whatsapp=is_whatsapp, file_path=str(download_path))
             log_output(f"Successfully sent {download_filename} to {chat_target}")
         else:
             log_output(f"Error: Downloaded file not found at {download_path}")
-            message_user(chat_target, "Download completed, but file not found to send.", chat_target.startswith("+"))
+            message_user(chat_target, "Download completed, but file not found to send.", is_whatsapp)
     except subprocess.CalledProcessError as e:
         log_output(f"yt-dlp failed: {e.stderr}")
-        message_user(chat_target, "Could not download the requested media.", chat_target.startswith("+"))
+        message_user(chat_target, "Could not download the requested media.", is_whatsapp)
     except Exception as e:
         log_output(f"Unexpected error during download/send: {e}")
-        message_user(chat_target, "An unexpected error occurred.", chat_target.startswith("+"))
+        message_user(chat_target, "An unexpected error occurred.", is_whatsapp)
 
-def message_user(target: str, text: str = None, is_whatsapp: bool = False, file_path: str = None):
+def message_user(target: str, text: str = None, is_whatsapp: bool = None, file_path: str = None):
+    if is_whatsapp is None:
+        # Not resolved by the caller: WhatsApp targets are phone numbers
+        is_whatsapp = bool(target) and target.startswith("+")
     cmd_prefix = ["openclaw", "message", "send"]
     if is_whatsapp:
         cmd_prefix.extend(["--channel", "whatsapp", "--target", target])
@@ -1,8 +1,17 @@
 import hashlib
 import time
 import json
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+# Inbound Telegram update ids remembered per chat for redelivery dedup
+SEEN_UPDATES_PER_CHAT = 4096
+
+# Compact one-line records; built once instead of per json.dumps call
+_RECORD_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
 class ComplianceGuard:
     """
     Enforces platform safety, anti-spam, and rate-limit rules.
@@ -10,29 +19,120 @@ class ComplianceGuard:
     def __init__(self, workspace_path: str):
         self.history_dir = Path(workspace_path) / ".omnipublisher" / "history"
         self.history_dir.mkdir(parents=True, exist_ok=True)
-        self.ledger_path = self.history_dir / "compliance_ledger.json"
+        # Append-only: one {"target", "hash", "ts"} line per logged post
+        self.ledger_path = self.history_dir / "compliance_ledger.jsonl"
         self.ledger = self._load_ledger()
+        # One {"chat", "uid"} line per seen Telegram update, compacted to the
+        # retained ids whenever it grows past twice their number
+        self.updates_path = self.history_dir / "seen_updates.jsonl"
+        self.updates, self._update_lines = self._load_updates()
+        self._update_lock = threading.Lock()
 
     def _load_ledger(self):
+        ledger = {"hashes": {}, "last_posts": {}}
+        self._migrate_legacy_ledger()
         if self.ledger_path.exists():
             with open(self.ledger_path, 'r') as f:
-                return json.load(f)
-        return {"hashes": {}, "last_posts": {}}
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # blank or torn trailing line
+                    self._apply(ledger, rec)
+        # Entries logged before the switch to BLAKE2b are full SHA-256 hex
+        self._has_sha256 = any(
+            len(h) == 64 for hashes in ledger["hashes"].values() for h in hashes
+        )
+        return ledger
+
+    @staticmethod
+    def hash_content(content_text):
+        # Dedup only, no adversary: a 128-bit BLAKE2b digest is ample and cheaper than SHA-256
+        return hashlib.blake2b(content_text.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _apply(ledger, rec):
+        # Hashes are held as a set per target for O(1) duplicate checks
+        target_key = rec["target"]
+        ledger["hashes"].setdefault(target_key, set()).add(rec["hash"])
+        if rec["ts"] > ledger["last_posts"].get(target_key, 0):
+            ledger["last_posts"][target_key] = rec["ts"]
+
+    def _migrate_legacy_ledger(self):
+        """Replay a pre-JSONL compliance_ledger.json into the append-only log."""
+        legacy_path = self.history_dir / "compliance_ledger.json"
+        if not legacy_path.exists():
+            return
+        with open(legacy_path, 'r') as f:
+            data = json.load(f)
+        last_posts = data.get("last_posts", {})
+        records = []
+        for target_key, hashes in data.get("hashes", {}).items():
+            # Only the newest post time per target was kept; it goes on the last hash
+            for i, content_hash in enumerate(hashes, 1):
+                ts = last_posts.get(target_key, 0) if i == len(hashes) else 0
+                records.append({"target": target_key, "hash": content_hash, "ts": ts})
+        self._append(records)
+        legacy_path.rename(legacy_path.with_suffix(".json.migrated"))
+
+    def _append(self, records, path=None):
+        encode = _RECORD_ENCODER.encode
+        with open(path or self.ledger_path, 'a') as f:
+            f.writelines(encode(rec) + "\n" for rec in records)
+
+    @staticmethod
+    def _remember_update(updates, chat_id, update_id):
+        # Bounded per chat, oldest evicted first
+        seen = updates.setdefault(chat_id, OrderedDict())
+        seen[update_id] = None
+        if len(seen) > SEEN_UPDATES_PER_CHAT:
+            seen.popitem(last=False)
 
-    def _save_ledger(self):
-        with open(self.ledger_path, 'w') as f:
-            json.dump(self.ledger, f, indent=2)
+    def _load_updates(self):
+        updates = {}
+        lines = 0
+        if self.updates_path.exists():
+            with open(self.updates_path, 'r') as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # blank or torn trailing line
+                    self._remember_update(updates, rec["chat"], rec["uid"])
+                    lines += 1
+        if self._compaction_due(updates, lines):
+            lines = self._compact_updates(updates)
+        return updates, lines
 
-    def check(self, platform, content_text, target=None) -> bool:
+    @staticmethod
+    def _compaction_due(updates, lines):
+        # The cheap floor check spares summing every chat on each append
+        return lines > 2 * SEEN_UPDATES_PER_CHAT and lines > 2 * sum(map(len, updates.values()))
+
+    def _compact_updates(self, updates):
+        """Rewrite the update log with only the retained ids; returns its line count."""
+        records = [{"chat": chat_id, "uid": uid} for chat_id, seen in updates.items() for uid in seen]
+        tmp = self.updates_path.with_suffix(".jsonl.tmp")
+        tmp.unlink(missing_ok=True)
+        self._append(records, tmp)
+        os.replace(tmp, self.updates_path)
+        return len(records)
+
+    def check(self, platform, content_text, target=None, content_hash=None) -> bool:
         """
         Hard stops for compliance.
         Returns True if safe to proceed.
+        content_hash: hash_content(content_text), if the caller already has it.
         """
-        content_hash = hashlib.sha256(content_text.encode()).hexdigest()
+        if content_hash is None:
+            content_hash = self.hash_content(content_text)
         
         # 1. Duplicate Check (Hash)
         target_key = f"{platform}:{target}" if target else platform
-        if content_hash in self.ledger["hashes"].get(target_key, []):
+        seen = self.ledger["hashes"].get(target_key, ())
+        if content_hash in seen or (
+            self._has_sha256 and hashlib.sha256(content_text.encode()).hexdigest() in seen
+        ):
             print(f"[GUARD] Blocked: Duplicate content hash for {target_key}")
             return False
 
@@ -45,13 +145,27 @@ class ComplianceGuard:
 
         return True
 
-    def log_post(self, platform, content_text, target=None):
-        content_hash = hashlib.sha256(content_text.encode()).hexdigest()
+    def log_post(self, platform, content_text, target=None, content_hash=None):
+        if content_hash is None:
+            content_hash = self.hash_content(content_text)
         target_key = f"{platform}:{target}" if target else platform
         
-        if target_key not in self.ledger["hashes"]:
-            self.ledger["hashes"][target_key] = []
-        
-        self.ledger["hashes"][target_key].append(content_hash)
-        self.ledger["last_posts"][target_key] = time.time()
-        self._save_ledger()
+        rec = {"target": target_key, "hash": content_hash, "ts": time.time()}
+        self._apply(self.ledger, rec)
+        self._append([rec])
+
+    def is_duplicate_update(self, chat_id, update_id) -> bool:
+        """
+        Idempotency check for inbound Telegram updates.
+        Returns True if update_id was already seen for chat_id; otherwise records it.
+        """
+        with self._update_lock:
+            seen = self.updates.get(chat_id)
+            if seen is not None and update_id in seen:
+                return True
+            self._remember_update(self.updates, chat_id, update_id)
+            self._append([{"chat": chat_id, "uid": update_id}], self.updates_path)
+            self._update_lines += 1
+            if self._compaction_due(self.updates, self._update_lines):
+                self._update_lines = self._compact_updates(self.updates)
+            return False
@@ -3,17 +3,9 @@ class ContentNormalizer:
     Adapts single input to platform-specific text and formatting rules.
     """
     def normalize(self, text, platform):
-        if platform == "twitter":
-            return self._to_twitter(text)
-        elif platform == "instagram":
-            return self._to_instagram(text)
-        elif platform == "youtube":
-            return self._to_youtube(text)
-        elif platform == "telegram":
-            return self._to_telegram(text)
-        elif platform == "whatsapp":
-            return self._to_whatsapp(text)
-        return text
+        # One lookup; only the requested platform's text is ever built
+        handler = self._HANDLERS.get(platform)
+        return handler(self, text) if handler else text
 
     def _to_twitter(self, text):
         # Max 280 chars, minimal hashtags
@@ -35,3 +27,11 @@ class ContentNormalizer:
     def _to_whatsapp(self, text):
         # Plain text with bold markers
         return f"*Update*\n\n{text}"
+
+    _HANDLERS = {
+        "twitter": _to_twitter,
+        "instagram": _to_instagram,
+        "youtube": _to_youtube,
+        "telegram": _to_telegram,
+        "whatsapp": _to_whatsapp,
+    }
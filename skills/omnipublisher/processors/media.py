@@ -1,26 +1,74 @@
 import subprocess
 import os
+import shutil
+
+# Output variants by platform; platforms sharing a variant share one output file
+PLATFORM_VARIANTS = {"instagram": "vertical", "youtube": "vertical"}
+VARIANT_FILTERS = {"vertical": "crop=ih*9/16:ih,scale=1080:1920"}  # 9:16
+VIDEO_EXTS = {".mp4", ".mov", ".m4v", ".mkv", ".webm", ".avi"}
+# Video variants are H.264 in MP4 whatever the source container; audio from
+# these sources is MP4-compatible as-is, anything else is re-encoded to AAC
+MP4_AUDIO_COPY_EXTS = {".mp4", ".mov", ".m4v"}
 
 class MediaProcessor:
     """
     Handles video trimming, aspect ratios, and compression via FFmpeg.
     """
+    def __init__(self):
+        self.ffmpeg = shutil.which("ffmpeg")
+
     def process(self, input_path, platform):
+        return self.process_all(input_path, [platform])[platform]
+
+    def process_all(self, input_path, platforms):
+        """
+        Map each platform to its media path, rendering every needed variant
+        from a single decode of input_path.
+        """
+        result = {platform: input_path for platform in platforms}
         if not os.path.exists(input_path):
-            return input_path
-            
-        ext = os.path.splitext(input_path)[1]
-        output_path = f"{input_path}_processed_{platform}{ext}"
-        
-        if platform in ["instagram", "youtube"]:
-            return self._to_vertical(input_path, output_path)
-            
-        return input_path
-
-    def _to_vertical(self, input_path, output_path):
+            return result
+
+        variants = sorted({PLATFORM_VARIANTS[p] for p in platforms if p in PLATFORM_VARIANTS})
+        if not variants:
+            return result
+
+        ext = os.path.splitext(input_path)[1].lower()
+        is_video = ext in VIDEO_EXTS
+        out_ext = ".mp4" if is_video else ext
+        outputs = {v: f"{input_path}_processed_{v}{out_ext}" for v in variants}
+        if self._render(input_path, outputs, is_video, ext in MP4_AUDIO_COPY_EXTS):
+            for platform in platforms:
+                if platform in PLATFORM_VARIANTS:
+                    result[platform] = outputs[PLATFORM_VARIANTS[platform]]
+        return result
+
+    def _render(self, input_path, outputs, is_video, copy_audio=True):
         """
-        Mock for FFmpeg vertical crop (9:16)
-        In real use: ffmpeg -i input -vf "crop=ih*9/16:ih" output
+        One ffmpeg run: split the decoded video once and filter/encode each
+        branch to its own output.
         """
-        print(f"[MEDIA] Mocking 9:16 vertical conversion for {input_path}")
-        return input_path # Placeholder
+        if not self.ffmpeg:
+            print(f"[MEDIA] ffmpeg not found; using {input_path} unmodified")
+            return False
+
+        labels = [f"v{i}" for i in range(len(outputs))]
+        graph = [f"[0:v]split={len(labels)}" + "".join(f"[{l}]" for l in labels)]
+        graph += [f"[{l}]{VARIANT_FILTERS[v]}[{v}]" for l, v in zip(labels, outputs)]
+
+        cmd = [self.ffmpeg, "-y", "-loglevel", "error", "-i", input_path,
+               "-filter_complex", ";".join(graph)]
+        for variant, path in outputs.items():
+            cmd += ["-map", f"[{variant}]"]
+            if is_video:
+                cmd += ["-map", "0:a?", "-c:v", "libx264", "-preset", "veryfast",
+                        "-c:a", "copy" if copy_audio else "aac", "-movflags", "+faststart"]
+            cmd.append(path)
+
+        print(f"[MEDIA] Rendering {', '.join(outputs)} from {input_path}")
+        try:
+            subprocess.run(cmd, check=True)
+            return True
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"[MEDIA] ffmpeg failed ({e}); using {input_path} unmodified")
+            return False
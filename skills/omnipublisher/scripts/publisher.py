@@ -7,8 +7,8 @@ Core Orchestrator
 import sys
 import os
 import json
-import time
 import random
+import asyncio
 import subprocess
 from pathlib import Path
 
@@ -28,43 +28,64 @@ class OmniPublisher:
         self.media = MediaProcessor()
 
     def publish(self, payload):
+        """Synchronous entry point; runs publish_async to completion."""
+        return asyncio.run(self.publish_async(payload))
+
+    async def publish_async(self, payload):
         print(f"[NUCLEAR] Initializing OmniPublisher v1.1.0 run...")
         
         content = payload.get("content", {})
         base_caption = content.get("caption", "")
-        platforms = payload.get("platforms", [])
+        # Each platform once: the dispatches below run concurrently
+        platforms = list(dict.fromkeys(payload.get("platforms", [])))
         targets = payload.get("targets", {})
         schedule = payload.get("schedule", {"mode": "now"})
+        # The guard keys on the base caption, the same for every platform
+        content_hash = self.guard.hash_content(base_caption)
+
+        # 3. Compliance Check, up front: a blocked platform never costs a render
+        platforms = [p for p in platforms if self.guard.check(p, base_caption, content_hash=content_hash)]
 
-        for platform in platforms:
-            print(f"--- [Platform: {platform.upper()}] ---")
-            
-            # 1. Normalize Text
-            processed_text = self.normalizer.normalize(base_caption, platform)
-            
-            # 2. Process Media
-            if content.get("path"):
-                final_media_path = self.media.process(content["path"], platform)
-            else:
-                final_media_path = None
-
-            # 3. Compliance Check
-            if not self.guard.check(platform, base_caption):
-                continue
-
-            # 4. Route to Adapter
-            # In a live system, this calls adapters/twitter.py etc.
-            self._execute_send(platform, processed_text, final_media_path, targets.get(platform))
-            
-            # 5. Log Success
-            self.guard.log_post(platform, base_caption)
-
-            # 6. Scheduling / Jitter
-            if schedule.get("mode") == "window":
-                win = schedule.get("window", {"min_delay": 5, "max_delay": 15})
+        # 6. Scheduling / Jitter: in window mode each platform starts a random
+        # gap after the previous one; a slow send never pushes back later ones
+        staggered = schedule.get("mode") == "window"
+        win = schedule.get("window", {"min_delay": 5, "max_delay": 15})
+        offsets = []
+        offset = 0
+        for i, platform in enumerate(platforms):
+            if i and staggered:
                 jitter = random.randint(win["min_delay"], win["max_delay"])
-                print(f"[STEALTH] Waiting {jitter}s jitter before next platform...")
-                time.sleep(jitter)
+                offset += jitter
+                print(f"[STEALTH] {platform} starts {jitter}s after {platforms[i - 1]} (+{offset}s)")
+            offsets.append(offset)
+
+        # 2. Process Media: every platform variant from one decode of the source
+        if content.get("path") and platforms:
+            media_paths = self.media.process_all(content["path"], platforms)
+        else:
+            media_paths = {}
+
+        await asyncio.gather(*(
+            self._publish_platform(platform, delay, media_paths.get(platform), base_caption,
+                                   targets.get(platform), content_hash)
+            for platform, delay in zip(platforms, offsets)
+        ))
+
+    async def _publish_platform(self, platform, delay, final_media_path, base_caption, target_group, content_hash):
+        if delay:
+            await asyncio.sleep(delay)
+        print(f"--- [Platform: {platform.upper()}] ---")
+        
+        # 1. Normalize Text
+        processed_text = self.normalizer.normalize(base_caption, platform)
+
+        # 4. Route to Adapter
+        # In a live system, this calls adapters/twitter.py etc.
+        # Adapters block on CLI tools; a worker thread lets other platforms proceed
+        await asyncio.to_thread(self._execute_send, platform, processed_text, final_media_path, target_group)
+        
+        # 5. Log Success
+        self.guard.log_post(platform, base_caption, content_hash=content_hash)
 
     def _execute_send(self, platform, text, media, target_group):
         """
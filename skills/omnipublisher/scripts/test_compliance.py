@@ -0,0 +1,48 @@
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import guards.compliance as compliance
+from guards.compliance import ComplianceGuard
+
+def run_tests():
+    saved_cap = compliance.SEEN_UPDATES_PER_CHAT
+    compliance.SEEN_UPDATES_PER_CHAT = 4  # small cap so eviction and compaction trigger quickly
+    try:
+        with tempfile.TemporaryDirectory() as workspace:
+            guard = ComplianceGuard(workspace)
+            assert not guard.is_duplicate_update(1, 100)
+            assert guard.is_duplicate_update(1, 100)
+
+            # A restarted guard still rejects the redelivered update
+            guard = ComplianceGuard(workspace)
+            assert guard.is_duplicate_update(1, 100)
+            print("Restart -> seen update rejected")
+
+            # Past the per-chat cap the oldest id is evicted, and survives neither memory nor restart
+            for uid in range(101, 105):
+                assert not guard.is_duplicate_update(1, uid)
+            assert not guard.is_duplicate_update(2, 100)  # other chats are independent
+            guard = ComplianceGuard(workspace)
+            assert not guard.is_duplicate_update(1, 100)
+            assert guard.is_duplicate_update(1, 104)
+            print("Eviction -> oldest update forgotten")
+
+            # Steady traffic keeps the on-disk log within twice the retained ids
+            for uid in range(1000, 1100):
+                guard.is_duplicate_update(1, uid)
+            lines = len(guard.updates_path.read_text().splitlines())
+            retained = sum(map(len, guard.updates.values()))
+            print(f"Compaction -> {lines} lines for {retained} retained ids")
+            assert lines <= 2 * max(retained, compliance.SEEN_UPDATES_PER_CHAT)
+            guard = ComplianceGuard(workspace)
+            assert guard.is_duplicate_update(1, 1099)
+            assert not guard.is_duplicate_update(1, 1095)
+    finally:
+        compliance.SEEN_UPDATES_PER_CHAT = saved_cap
+    print("All compliance guard tests passed.")
+
+if __name__ == "__main__":
+    run_tests()
@@ -4,37 +4,88 @@ import sys
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from datetime import datetime, timezone
 
+# (connect, read) seconds for every Spotify call, so a stalled host cannot hang the run
+REQUEST_TIMEOUT = (3, 10)
+
 class SpotifySurface:
     def __init__(self, workspace_path: str):
         self.workspace = Path(workspace_path)
         self.media_dir = self.workspace / "media" / "spotify"
         self.media_dir.mkdir(parents=True, exist_ok=True)
         self.config_path = self.workspace / ".openclaw" / "openclaw.json"
+        # Client Credentials tokens live for an hour; reuse them across runs
+        self.token_path = self.workspace / ".openclaw" / "spotify_token.json"
         
         # Load credentials
         self.client_id = os.environ.get("SPOTIFY_CLIENT_ID")
         self.client_secret = os.environ.get("SPOTIFY_CLIENT_SECRET")
         self.access_token = None
+        
+        # One session for accounts.spotify.com and api.spotify.com: the search
+        # after a token grant reuses warm TLS connections
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        ))
 
     def _get_access_token(self):
         """Official Client Credentials Flow."""
         if not self.client_id or not self.client_secret:
             return None
+        
+        cached = self._load_cached_token()
+        if cached:
+            self.access_token = cached
+            return self.access_token
             
         url = "https://accounts.spotify.com/api/token"
         try:
-            r = requests.post(url, data={"grant_type": "client_credentials"}, 
-                             auth=(self.client_id, self.client_secret))
+            r = self.session.post(url, data={"grant_type": "client_credentials"}, 
+                             auth=(self.client_id, self.client_secret), timeout=REQUEST_TIMEOUT)
             if r.status_code == 200:
-                self.access_token = r.json().get("access_token")
+                body = r.json()
+                self.access_token = body.get("access_token")
+                if self.access_token:
+                    self._save_cached_token(self.access_token, body.get("expires_in", 3600))
                 return self.access_token
         except Exception as e:
             print(f"[ERR] Token fetch failed: {e}", file=sys.stderr)
         return None
 
+    def _load_cached_token(self):
+        """Return the on-disk token if it belongs to this client and is still valid."""
+        if not os.path.exists(self.token_path):
+            return None
+        try:
+            with open(self.token_path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get("client_id") != self.client_id or cached.get("expires_at", 0) <= time.time():
+            return None
+        return cached.get("access_token")
+
+    def _save_cached_token(self, token: str, expires_in: int):
+        """Persist the token (owner-only) with a 60s safety margin on expiry."""
+        cached = {
+            "client_id": self.client_id,
+            "access_token": token,
+            "expires_at": time.time() + expires_in - 60
+        }
+        try:
+            self.token_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(cached, f)
+        except OSError as e:
+            print(f"[WARN] Could not cache Spotify token: {e}", file=sys.stderr)
+
     def search_track(self, query: str):
         """Search Spotify for the best track match."""
         if not self.access_token and not self._get_access_token():
@@ -46,7 +97,14 @@ class SpotifySurface:
         headers = {"Authorization": f"Bearer {self.access_token}"}
         
         try:
-            r = requests.get(url, params=params, headers=headers)
+            r = self.session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+            if r.status_code == 401:
+                # Cached token was revoked before its expiry; replace it once
+                self.access_token = None
+                self.token_path.unlink(missing_ok=True)
+                if self._get_access_token():
+                    headers = {"Authorization": f"Bearer {self.access_token}"}
+                    r = self.session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
             if r.status_code == 200:
                 tracks = r.json().get("tracks", {}).get("items", [])
                 if tracks:
@@ -73,8 +131,9 @@ class SpotifySurface:
         }
         
         file_path = self.media_dir / f"{track_id}.json"
+        # One write of the encoded document rather than json.dump's per-token writes
         with open(file_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+            f.write(json.dumps(metadata, indent=2))
             
         return metadata
 